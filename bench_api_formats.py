@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# Compare the response formats of the CMS API (see cms_sarkande/doc/api_formats.md)
+# Usage: odoo-bin shell -d <db> < bench_api_formats.py
+
+import json
+import time
+
+from odoo.addons.cms_sarkande.tools import serializers
+
+ROUNDS = 200
+
+
+def timed(encoder, value):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        content = encoder(value)
+    return content, (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def bench(label, value):
+    encoders = [('json.dumps (before)', lambda v: json.dumps(v, ensure_ascii=False).encode())]
+    encoders += [(fmt, lambda v, fmt=fmt: serializers.encode(v, fmt)) for fmt in serializers.get_available_formats()]
+
+    print(f"\n{label}")
+    baseline = None
+    for name, encoder in encoders:
+        content, ms = timed(encoder, value)
+        baseline = baseline or (len(content), ms)
+        print(f"  {name:<20} {len(content):>9} bytes ({len(content) / baseline[0]:>4.0%})"
+              f"  {ms:>8.3f} ms ({ms / baseline[1]:>4.0%})")
+
+
+def bench_api_formats():
+    print(f"orjson: {'yes' if serializers.orjson else 'no'}, msgpack: {'yes' if serializers.msgpack else 'no'}")
+    lang = 'fr_FR' if env['res.lang'].search_count([('code', '=', 'fr_FR')]) else 'en_US'
+
+    pages = env['cms.page'].search([], order='id')
+    pages_data, next_after = env['cms.page'].get_pages_list()
+    bench(f"/api/cms/pages ({len(pages_data)} pages)",
+          {'success': True, 'data': pages_data, 'count': len(pages_data), 'next': None})
+
+    if pages:
+        largest = max(pages, key=lambda page: len(page.block_ids))
+        bench(f"/api/cms/page/{largest.slug} ({len(largest.block_ids)} blocks)",
+              {'success': True, 'data': largest.get_page_data(lang=lang)})
+
+    translations = env['cms.translation.key'].get_translations(lang)
+    bench(f"/api/translations/{lang} ({len(translations)} keys)",
+          {'success': True, 'data': translations, 'lang': lang})
+
+
+bench_api_formats()
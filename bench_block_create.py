@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# Benchmark of cms.block.create: 10k blocks of mixed types in one call
+# Usage: odoo-bin shell -d <db> < bench_block_create.py
+# Everything is rolled back at the end.
+
+import time
+
+BLOCKS = 10000
+
+BLOCK_VALUES = [
+    {'block_type': 'heading', 'heading_text': 'Heading', 'heading_level': 'h2'},
+    {'block_type': 'text', 'text_content': 'Some text'},
+    {'block_type': 'html', 'html_content': '<p>Some <b>HTML</b></p>'},
+    {'block_type': 'image', 'image_url': '/logo.png', 'image_alt': 'Logo'},
+    {'block_type': 'hero', 'hero_title': 'Title', 'hero_subtitle': 'Subtitle', 'hero_button_text': 'Go',
+     'hero_button_url': '/'},
+    {'block_type': 'user_list', 'limit': 5},
+]
+
+
+def bench(label, compact, one_by_one=False):
+    env['ir.config_parameter'].set_param('cms_sarkande.compact_storage', str(compact))
+    page = env['cms.page'].create({'name': 'Bench', 'slug': f'bench-block-create-{time.time_ns()}'})
+    vals_list = [
+        dict(BLOCK_VALUES[i % len(BLOCK_VALUES)], name=f'Block {i}', page_id=page.id, sequence=i)
+        for i in range(BLOCKS)
+    ]
+
+    env.flush_all()
+    queries = env.cr.sql_log_count
+    start = time.perf_counter()
+    if one_by_one:
+        for vals in vals_list:
+            env['cms.block'].create(vals)
+    else:
+        env['cms.block'].create(vals_list)
+    env.flush_all()
+    elapsed = time.perf_counter() - start
+    queries = env.cr.sql_log_count - queries
+
+    print(f"{label:<32} {elapsed:>8.2f} s  {queries:>7} queries  {elapsed / BLOCKS * 1e6:>7.0f} µs/block")
+    env.invalidate_all()
+
+
+def bench_block_create():
+    compact_storage = env['ir.config_parameter'].get_param('cms_sarkande.compact_storage', 'False')
+    print(f"{BLOCKS} blocks, types: {', '.join(values['block_type'] for values in BLOCK_VALUES)}")
+    try:
+        bench('components, one create', compact=False)
+        bench('compact, one create', compact=True)
+        bench('components, one create/block', compact=False, one_by_one=True)
+    finally:
+        env.cr.rollback()
+        env['ir.config_parameter'].set_param('cms_sarkande.compact_storage', compact_storage)
+        env.cr.commit()
+
+
+bench_block_create()
@@ -9,4 +9,7 @@ npm run build
 rm -rf /Users/sarkande/docker/CMS_ODOO_NEXT/odoodidonc/cms_sarkande/static/front/*
 cp -r out/* /Users/sarkande/docker/CMS_ODOO_NEXT/odoodidonc/cms_sarkande/static/front/
 
+# Precompress the assets (.gz/.br) and write the manifest read by the Odoo controller
+python3 /Users/sarkande/docker/CMS_ODOO_NEXT/odoodidonc/cms_sarkande/tools/static_build.py /Users/sarkande/docker/CMS_ODOO_NEXT/odoodidonc/cms_sarkande/static/front
+
 echo "Build completed successfully!"
\ No newline at end of file
@@ -1,6 +1,8 @@
 import Link from 'next/link';
+import { useRouter } from 'next/router';
 import { useState, useEffect } from 'react';
 import { useTranslation } from '@/contexts/TranslationContext';
+import { loadBootstrap } from '@/lib/bootstrap';
 import LanguageSelector from './LanguageSelector';
 import styles from './Navigation.module.scss';
 
@@ -13,12 +15,21 @@ interface Page {
 
 export default function Navigation() {
   const [pages, setPages] = useState<Page[]>([]);
-  const { t } = useTranslation();
+  const { t, currentLang } = useTranslation();
+  const router = useRouter();
 
   useEffect(() => {
+    if (!router.isReady) return;
+
     const fetchPages = async () => {
       try {
-        const response = await fetch('http://localhost:8219/api/cms/pages');
+        // Sur une page CMS, la liste vient de la requête bootstrap de la page
+        if (router.pathname === '/[slug]') {
+          const data = await loadBootstrap(String(router.query.slug), currentLang);
+          setPages(data.pages || []);
+          return;
+        }
+        const response = await fetch('http://localhost:8219/api/cms/pages?navigation=1');
         const result = await response.json();
         if (result.success) {
           setPages(result.data || []);
@@ -29,7 +40,8 @@ export default function Navigation() {
     };
 
     fetchPages();
-  }, []);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [router.isReady]);
 
   return (
     <nav className={styles.nav}>
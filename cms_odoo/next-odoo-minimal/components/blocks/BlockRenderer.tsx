@@ -43,7 +43,7 @@ export default function BlockRenderer({ block }: BlockRendererProps) {
       );
 
     case 'user_list':
-      return <UserListBlock users={block.users || []} limit={block.limit} />;
+      return <UserListBlock blockId={block.id} users={block.users || []} limit={block.limit} next={block.next} />;
 
     default:
       console.warn(`Unknown block type: ${block.type}`);
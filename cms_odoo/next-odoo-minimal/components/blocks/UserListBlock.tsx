@@ -1,3 +1,4 @@
+import { useState, useEffect } from 'react';
 import { useTranslation } from '@/contexts/TranslationContext';
 import styles from './UserListBlock.module.scss';
 
@@ -10,12 +11,41 @@ interface User {
 }
 
 interface UserListBlockProps {
+  blockId: number;
   users: User[];
   limit?: number;
+  next?: number | null;
 }
 
-export default function UserListBlock({ users, limit }: UserListBlockProps) {
+export default function UserListBlock({ blockId, users: firstUsers, limit, next: firstNext }: UserListBlockProps) {
   const { t } = useTranslation();
+  const [users, setUsers] = useState<User[]>(firstUsers);
+  const [next, setNext] = useState<number | null>(firstNext ?? null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // Nouvelle page de données (changement de langue, rechargement)
+  useEffect(() => {
+    setUsers(firstUsers);
+    setNext(firstNext ?? null);
+  }, [firstUsers, firstNext]);
+
+  // Pages suivantes via l'API du bloc, sans recharger la page
+  const loadMore = async () => {
+    if (next === null) return;
+    setLoadingMore(true);
+    try {
+      const response = await fetch(`http://localhost:8219/api/cms/block/${blockId}/users?offset=${next}&limit=${limit || 10}`);
+      const result = await response.json();
+      if (result.success) {
+        setUsers((current) => [...current, ...result.data]);
+        setNext(result.next);
+      }
+    } catch (error) {
+      console.error('Error fetching users:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   return (
     <div className={styles.userListBlock}>
@@ -38,6 +68,11 @@ export default function UserListBlock({ users, limit }: UserListBlockProps) {
           </div>
         ))}
       </div>
+      {next !== null && (
+        <button type="button" className={styles.loadMore} onClick={loadMore} disabled={loadingMore}>
+          {t('block.load_more')}
+        </button>
+      )}
     </div>
   );
 }
@@ -1,4 +1,7 @@
 import { createContext, useContext, useState, useEffect, ReactNode } from 'react';
+import { useRouter } from 'next/router';
+import { getCmsSnapshot } from '@/lib/cmsSnapshot';
+import { loadBootstrap } from '@/lib/bootstrap';
 
 interface Language {
   code: string;
@@ -21,15 +24,29 @@ interface TranslationProviderProps {
 }
 
 export function TranslationProvider({ children }: TranslationProviderProps) {
-  const [currentLang, setCurrentLang] = useState<string>('en_US');
+  const [currentLang, setCurrentLang] = useState<string>(() => (
+    getCmsSnapshot()?.lang
+    || (typeof window !== 'undefined' && localStorage.getItem('preferred_language'))
+    || 'en_US'
+  ));
   const [translations, setTranslations] = useState<Record<string, string>>({});
   const [availableLanguages, setAvailableLanguages] = useState<Language[]>([]);
   const [loading, setLoading] = useState(true);
+  const router = useRouter();
+  // Sur une page CMS, langues et traductions viennent de la requête bootstrap de la page
+  const bootstrapSlug = router.pathname === '/[slug]' && router.query.slug ? String(router.query.slug) : null;
 
   // Charger les langues disponibles
   useEffect(() => {
+    if (!router.isReady) return;
+
     const fetchLanguages = async () => {
       try {
+        if (bootstrapSlug) {
+          const data = await loadBootstrap(bootstrapSlug, currentLang);
+          setAvailableLanguages(data.languages || []);
+          return;
+        }
         const response = await fetch('http://localhost:8219/api/languages');
         const result = await response.json();
         if (result.success) {
@@ -41,13 +58,21 @@ export function TranslationProvider({ children }: TranslationProviderProps) {
     };
 
     fetchLanguages();
-  }, []);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [router.isReady]);
 
   // Charger les traductions pour la langue courante
   useEffect(() => {
+    if (!router.isReady) return;
+
     const fetchTranslations = async () => {
       try {
         setLoading(true);
+        if (bootstrapSlug) {
+          const data = await loadBootstrap(bootstrapSlug, currentLang);
+          setTranslations(data.translations || {});
+          return;
+        }
         const response = await fetch(`http://localhost:8219/api/translations/${currentLang}`);
         const result = await response.json();
         if (result.success) {
@@ -61,7 +86,7 @@ export function TranslationProvider({ children }: TranslationProviderProps) {
     };
 
     fetchTranslations();
-  }, [currentLang]);
+  }, [currentLang, router.isReady, bootstrapSlug]);
 
   // Fonction de traduction
   const t = (key: string): string => {
@@ -74,19 +99,11 @@ export function TranslationProvider({ children }: TranslationProviderProps) {
     // Sauvegarder dans localStorage
     if (typeof window !== 'undefined') {
       localStorage.setItem('preferred_language', lang);
+      // Lu par Odoo pour servir la page pré-rendue dans cette langue
+      document.cookie = `cms_lang=${lang}; path=/; max-age=31536000; SameSite=Lax`;
     }
   };
 
-  // Charger la langue préférée au démarrage
-  useEffect(() => {
-    if (typeof window !== 'undefined') {
-      const savedLang = localStorage.getItem('preferred_language');
-      if (savedLang) {
-        setCurrentLang(savedLang);
-      }
-    }
-  }, []);
-
   return (
     <TranslationContext.Provider value={{ t, currentLang, setLanguage, availableLanguages, loading }}>
       {children}
@@ -0,0 +1,41 @@
+// Une seule requête /api/cms/bootstrap par (page, langue), partagée par la page,
+// la navigation et le contexte de traduction
+
+import { getCmsSnapshot } from '@/lib/cmsSnapshot';
+
+const API_URL = 'http://localhost:8219';
+
+export interface Bootstrap {
+  page?: any;
+  pages?: any[];
+  languages?: any[];
+  translations?: Record<string, string>;
+}
+
+const requests = new Map<string, Promise<Bootstrap>>();
+
+// Parties demandées quand la page est déjà pré-rendue par Odoo (#__CMS_PAGE__)
+const SNAPSHOT_FIELDS = 'pages,languages,translations';
+
+export function loadBootstrap(slug: string, lang: string): Promise<Bootstrap> {
+  const key = `${slug}|${lang}`;
+  let request = requests.get(key);
+  if (!request) {
+    const snapshot = getCmsSnapshot();
+    const embedded = snapshot && snapshot.page.slug === slug && snapshot.lang === lang ? snapshot.page : null;
+    const fields = embedded ? `&fields=${SNAPSHOT_FIELDS}` : '';
+    request = fetch(`${API_URL}/api/cms/bootstrap/${encodeURIComponent(slug)}?lang=${lang}${fields}`)
+      .then(async (response) => {
+        const result = await response.json();
+        if (!response.ok || !result.success) {
+          throw new Error(result.error || `Erreur HTTP: ${response.status}`);
+        }
+        const data = result.data as Bootstrap;
+        return embedded ? { ...data, page: embedded } : data;
+      });
+    // Ne pas garder un échec en cache
+    request.catch(() => requests.delete(key));
+    requests.set(key, request);
+  }
+  return request;
+}
@@ -0,0 +1,26 @@
+// Données de la page pré-rendue par Odoo (script #__CMS_PAGE__), null sinon
+
+export interface CmsSnapshot {
+  lang: string;
+  page: {
+    id: number;
+    name: string;
+    slug: string;
+    title: string;
+    meta_description: string;
+    blocks: any[];
+  };
+}
+
+let snapshot: CmsSnapshot | null | undefined;
+
+export function getCmsSnapshot(): CmsSnapshot | null {
+  if (typeof document === 'undefined') {
+    return null;
+  }
+  if (snapshot === undefined) {
+    const element = document.getElementById('__CMS_PAGE__');
+    snapshot = element?.textContent ? JSON.parse(element.textContent) : null;
+  }
+  return snapshot ?? null;
+}
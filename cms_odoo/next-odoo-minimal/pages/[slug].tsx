@@ -4,6 +4,8 @@ import { useState, useEffect } from "react";
 import BlockRenderer from "@/components/blocks/BlockRenderer";
 import Navigation from "@/components/Navigation";
 import { useTranslation } from "@/contexts/TranslationContext";
+import { getCmsSnapshot } from "@/lib/cmsSnapshot";
+import { loadBootstrap } from "@/lib/bootstrap";
 import styles from "@/styles/Home.module.css";
 
 interface BlockData {
@@ -28,29 +30,27 @@ export default function CmsPage() {
   const { slug } = router.query;
   const { currentLang } = useTranslation();
 
-  const [pageData, setPageData] = useState<PageData | null>(null);
-  const [loading, setLoading] = useState(true);
+  // Page pré-rendue par Odoo : affichée sans attendre l'API
+  const snapshot = getCmsSnapshot();
+  const [pageData, setPageData] = useState<PageData | null>(snapshot?.page ?? null);
+  const [loading, setLoading] = useState(!snapshot);
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
     if (!slug) return;
 
+    if (snapshot && snapshot.page.slug === slug && snapshot.lang === currentLang) {
+      setPageData(snapshot.page);
+      setLoading(false);
+      return;
+    }
+
     const fetchPage = async () => {
       try {
         setLoading(true);
-        const response = await fetch(`http://localhost:8219/api/cms/page/${slug}?lang=${currentLang}`);
-
-        if (!response.ok) {
-          throw new Error(`Erreur HTTP: ${response.status}`);
-        }
-
-        const result = await response.json();
-
-        if (!result.success) {
-          throw new Error(result.error || 'Erreur lors du chargement de la page');
-        }
-
-        setPageData(result.data);
+        // Même requête que la navigation et les traductions
+        const data = await loadBootstrap(String(slug), currentLang);
+        setPageData(data.page);
         setError(null);
       } catch (err) {
         setError(err instanceof Error ? err.message : 'Erreur lors du chargement de la page');
@@ -17,16 +17,19 @@
         "views/cms_block_views.xml",
         "views/cms_block_component_views.xml",
         "views/cms_translation_views.xml",
+        "views/cms_translation_job_views.xml",
         "wizard/cms_page_translate_wizard_views.xml",
         "data/cms_demo_data.xml",
         "data/cms_translation_data.xml",
+        "data/cms_translation_job_data.xml",
+        "data/cms_page_snapshot_data.xml",
     ],
     "assets": {
         "web.assets_backend": [
             "cms_sarkande/static/src/js/cms_preview_modal.js",
             "cms_sarkande/static/src/xml/cms_preview_modal.xml",
-            "cms_sarkande/static/src/js/cms_preview_button.js",
-            "cms_sarkande/static/src/xml/cms_preview_button.xml",
+            "cms_sarkande/static/src/js/cms_preview.js",
+            "cms_sarkande/static/src/xml/cms_preview.xml",
             "cms_sarkande/static/src/css/cms_translation_preview.css",
         ],
     },
@@ -0,0 +1,18 @@
+import os
+
+from odoo.cli.command import Command
+
+from odoo.addons.cms_sarkande.tools import static_build
+
+
+class CmsBuildStatic(Command):
+    """Precompress the exported Next.js front and write its asset manifest"""
+    name = 'cms_build_static'
+    description = 'Precompress static/front (.gz/.br) and write asset-manifest.json'
+
+    def run(self, cmdargs):
+        default_root = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'front')
+        self.parser.add_argument('root', nargs='?', default=default_root,
+                                 help="Front folder to build (default: the module's static/front)")
+        args = self.parser.parse_args(args=cmdargs)
+        return static_build.main([args.root])
@@ -0,0 +1,43 @@
+import sys
+
+from odoo import api, SUPERUSER_ID
+from odoo.cli.command import Command
+from odoo.modules.registry import Registry
+from odoo.tools import config
+
+from odoo.addons.cms_sarkande.models.cms_page_io import IMPORT_CHUNK_SIZE
+
+
+class CmsPages(Command):
+    """Import or export the CMS pages as NDJSON, one page per line with its blocks and translations"""
+    name = 'cms_pages'
+    description = 'Import or export CMS pages as NDJSON (see cms.page.io)'
+
+    def run(self, cmdargs):
+        self.parser.add_argument('action', choices=['export', 'import'])
+        self.parser.add_argument('path', help='NDJSON file, "-" to export to the standard output')
+        self.parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE,
+                                 help='Pages imported per commit (default: %(default)s)')
+        self.parser.add_argument('--restart', action='store_true',
+                                 help='Import the whole file again, ignoring the checkpoint of a previous run')
+        args, odoo_args = self.parser.parse_known_args(args=cmdargs)
+        config.parse_config(odoo_args, setup_logging=True)
+        db_name = config['db_name']
+        if isinstance(db_name, list):
+            db_name = db_name[0] if db_name else None
+        if not db_name:
+            self.parser.error('a database is required (-d <db>)')
+
+        with Registry(db_name).cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            page_io = env['cms.page.io']
+            if args.action == 'export':
+                if args.path == '-':
+                    count = page_io._export_ndjson(sys.stdout)
+                else:
+                    with open(args.path, 'w', encoding='utf-8') as f:
+                        count = page_io._export_ndjson(f)
+            else:
+                count = page_io._import_ndjson(args.path, chunk_size=args.chunk_size, restart=args.restart)
+        # On stderr: the export may be written to stdout
+        sys.stderr.write(f'{count} pages {"exported" if args.action == "export" else "imported"}\n')
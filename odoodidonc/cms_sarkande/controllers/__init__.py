@@ -1 +1,2 @@
 from . import cms_front
+from . import fake_iap
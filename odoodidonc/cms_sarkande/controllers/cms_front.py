@@ -1,64 +1,215 @@
 from odoo import http
 from odoo.http import request
-from odoo.modules.module import get_module_path
-import os
-import mimetypes
 import json
+import logging
+import mmap
+from datetime import timezone
+
+from werkzeug.http import http_date, quote_etag
+
+from odoo.addons.cms_sarkande.tools import serializers
+from odoo.addons.cms_sarkande.tools.page_cache import listing_cache, page_cache, translations_cache
+from odoo.addons.cms_sarkande.tools.static_engine import get_static_engine, iter_chunks
+
+_logger = logging.getLogger(__name__)
+
+# Cache-Control par route API, surchargeable via le paramètre système
+# cms_sarkande.cache_control.<route>
+DEFAULT_CACHE_CONTROL = {
+    'page': 'no-cache',
+    'pages': 'no-cache',
+    'translations': 'no-cache',
+    'languages': 'public, max-age=300',
+    'snapshot': 'no-cache',
+    'bootstrap': 'no-cache',
+    'block_users': 'public, max-age=60',
+    'changes': 'no-cache',
+}
+
+# Routes dont le format de réponse est négocié sur Accept (voir doc/api_formats.md)
+NEGOTIATED_ROUTES = ('page', 'pages', 'translations', 'changes')
+
+# Taille maximale d'une page de /api/cms/block/<id>/users
+BLOCK_USERS_MAX_LIMIT = 100
+
+# Clés d'un utilisateur dans /api/users, avec les champs ORM qu'elles lisent
+USER_API_FIELDS = {
+    'id': [],
+    'name': ['name'],
+    'login': ['login'],
+    'email': ['email'],
+    'active': ['active'],
+    'company_id': ['company_id'],
+    'company_name': ['company_id'],
+    'image_url': ['partner_id'],
+}
+USERS_DEFAULT_LIMIT = 100
+USERS_BATCH_SIZE = 500
+
+# Parties de la réponse /api/cms/bootstrap, sélectionnables via ?fields=
+BOOTSTRAP_PARTS = ('page', 'pages', 'languages', 'translations')
+
+# Cookie posé par le front quand l'utilisateur choisit une langue
+LANG_COOKIE = 'cms_lang'
 
-MODULE_NAME = 'cms_sarkande'
 
 class CmsFront(http.Controller):
 
-    def _get_content_type(self, path):
-        """Détecter le type MIME basé sur l'extension du fichier"""
-        content_type, _ = mimetypes.guess_type(path)
-        if content_type is None:
-            content_type = 'application/octet-stream'
-        return content_type
+    def _get_cache_control(self, route):
+        """Cache-Control configuré pour une route API"""
+        return request.env['ir.config_parameter'].sudo().get_param(
+            f'cms_sarkande.cache_control.{route}', DEFAULT_CACHE_CONTROL[route])
+
+    def _not_modified(self, route, etag, last_modified=None, fmt='json'):
+        """Return a 304 response if the client copy is still valid, None otherwise.
+
+        If-Modified-Since alone says nothing of the format of the client copy,
+        so it is only trusted for the default json format.
+        """
+        httprequest = request.httprequest
+        if httprequest.if_none_match:
+            fresh = httprequest.if_none_match.contains_weak(etag)
+        elif httprequest.if_modified_since and last_modified and fmt == 'json':
+            fresh = last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= httprequest.if_modified_since
+        else:
+            fresh = False
+        if not fresh:
+            return None
+        return request.make_response(b'', headers=self._validator_headers(route, etag, last_modified), status=304)
+
+    def _validator_headers(self, route, etag, last_modified=None):
+        """ETag, Last-Modified and Cache-Control headers of an API response"""
+        headers = [
+            ('ETag', quote_etag(etag)),
+            ('Cache-Control', self._get_cache_control(route)),
+        ]
+        if last_modified:
+            headers.append(('Last-Modified', http_date(last_modified.replace(tzinfo=timezone.utc))))
+        if route in NEGOTIATED_ROUTES:
+            # On 304 responses as well, for caches to keep one copy per format
+            headers.append(('Vary', 'Accept'))
+        return headers
+
+    def _get_response_format(self, requested=None):
+        """Format of an API response (see tools/serializers.py), None if it cannot be produced"""
+        return serializers.negotiate(request.httprequest.accept_mimetypes, requested)
+
+    def _not_acceptable(self):
+        error_response = {
+            'success': False,
+            'error': f'Available formats: {", ".join(serializers.get_available_formats())}'
+        }
+        return request.make_response(
+            json.dumps(error_response),
+            headers=[
+                ('Content-Type', 'application/json'),
+                ('Access-Control-Allow-Origin', '*')
+            ],
+            status=406
+        )
 
     def _serve_static_file(self, relative_path):
         """Servir un fichier statique depuis le dossier front"""
-        path = os.path.join(get_module_path(MODULE_NAME), 'static', 'front', relative_path)
-        if not os.path.isfile(path):
+        asset = get_static_engine().get(relative_path)
+        if asset is None:
             return request.not_found()
 
-        content_type = self._get_content_type(path)
-        with open(path, 'rb') as f:
-            content = f.read()
-        return request.make_response(content, [('Content-Type', content_type)])
+        httprequest = request.httprequest
+        length = len(asset.variants['identity'])
+        byte_range = self._get_byte_range(asset, length)
+        if byte_range is False:
+            return request.make_response(b'', headers=[('Content-Range', f'bytes */{length}')], status=416)
+
+        # Ranges are always served from the uncompressed representation
+        encoding = 'identity' if byte_range else asset.select_encoding(httprequest.accept_encodings)
+        etag = asset.get_etag(encoding)
+        headers = [
+            ('Content-Type', asset.content_type),
+            ('ETag', quote_etag(etag)),
+            ('Last-Modified', http_date(asset.last_modified)),
+            ('Cache-Control', asset.cache_control),
+            ('Accept-Ranges', 'bytes'),
+        ]
+        if len(asset.variants) > 1:
+            headers.append(('Vary', 'Accept-Encoding'))
+
+        if httprequest.if_none_match:
+            fresh = httprequest.if_none_match.contains_weak(etag)
+        elif httprequest.if_modified_since:
+            fresh = asset.last_modified <= httprequest.if_modified_since
+        else:
+            fresh = False
+        if fresh:
+            return request.make_response(b'', headers=headers, status=304)
+
+        body = asset.variants[encoding]
+        status = 200
+        if encoding != 'identity':
+            headers.append(('Content-Encoding', encoding))
+        if byte_range:
+            start, stop = byte_range
+            headers.append(('Content-Range', f'bytes {start}-{stop - 1}/{length}'))
+            body, status = body[start:stop], 206
+        headers.append(('Content-Length', str(len(body))))
+        if isinstance(body, mmap.mmap):
+            body = iter_chunks(body)
+        return request.make_response(body, headers=headers, status=status)
+
+    def _get_byte_range(self, asset, length):
+        """(start, stop) of the requested byte range.
+
+        None when the whole file must be sent, False when the range cannot be
+        satisfied.
+        """
+        httprequest = request.httprequest
+        byte_range = httprequest.range
+        if byte_range is None or byte_range.units != 'bytes':
+            return None
+        # If-Range: a stale client copy gets the whole file again
+        if_range = httprequest.if_range
+        if if_range.etag and if_range.etag != asset.etag:
+            return None
+        if if_range.date and if_range.date != asset.last_modified:
+            return None
+        if len(byte_range.ranges) != 1:
+            return None
+        return byte_range.range_for_length(length) or False
 
     @http.route('/', type='http', auth='public', website=True)
     def index(self, **kwargs):
         # Servir index.html qui redirigera vers /home
-        path = os.path.join(get_module_path(MODULE_NAME),
-                            'static', 'front', 'index.html')
-        with open(path, 'rb') as f:
-            content = f.read()
-        return request.make_response(content, [('Content-Type', 'text/html')])
+        return self._serve_static_file('index.html')
 
     @http.route('/cms', type='http', auth='public', website=True)
     def cms_list(self, **kwargs):
         # Liste des pages CMS
-        path = os.path.join(get_module_path(MODULE_NAME),
-                            'static', 'front', 'cms.html')
-        if os.path.isfile(path):
-            with open(path, 'rb') as f:
-                content = f.read()
-            return request.make_response(content, [('Content-Type', 'text/html')])
-        return request.not_found()
+        return self._serve_static_file('cms.html')
 
     @http.route('/<string:slug>', type='http', auth='public', website=True)
-    def serve_cms_page(self, slug, **kwargs):
-        # Servir le template dynamique [slug].html pour les pages CMS
-        slug_template_path = os.path.join(get_module_path(MODULE_NAME),
-                                          'static', 'front', '[slug].html')
+    def serve_cms_page(self, slug, lang=None, **kwargs):
+        # Servir la page pré-rendue, ou le template dynamique [slug].html à défaut
+        lang = self._get_front_lang(lang)
+        snapshot = request.env['cms.page.snapshot'].sudo()._get_snapshot(slug, lang)
+        if snapshot is None:
+            return self._serve_static_file('[slug].html')
 
-        if os.path.isfile(slug_template_path):
-            with open(slug_template_path, 'rb') as f:
-                content = f.read()
-            return request.make_response(content, [('Content-Type', 'text/html')])
+        headers = [
+            ('Content-Type', 'text/html; charset=utf-8'),
+            ('Vary', 'Cookie'),
+        ]
+        if snapshot['cacheable']:
+            etag = f"snapshot-{snapshot['id']}-{snapshot['content_version']}-{lang}-{snapshot['shell_version']}"
+            not_modified = self._not_modified('snapshot', etag, snapshot['content_date'])
+            if not_modified:
+                return not_modified
+            headers += self._validator_headers('snapshot', etag, snapshot['content_date'])
+        return request.make_response(snapshot['html'], headers=headers)
 
-        return request.not_found()
+    def _get_front_lang(self, lang=None):
+        """Langue demandée (paramètre lang, puis cookie), en_US si elle n'est pas installée"""
+        lang = lang or request.httprequest.cookies.get(LANG_COOKIE)
+        installed = dict(request.env['res.lang'].sudo().get_installed())
+        return lang if lang in installed else 'en_US'
 
     # Routes pour les ressources Next.js référencées depuis la racine
     @http.route('/_next/<path:page>', type='http', auth='public', website=True)
@@ -77,40 +228,164 @@ class CmsFront(http.Controller):
 
     # API Routes pour Next.js
     @http.route('/api/users', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
-    def api_users(self, **kwargs):
-        """Retourne la liste des utilisateurs au format JSON"""
-        try:
-            # Récupérer tous les utilisateurs
-            users = request.env['res.users'].sudo().search([])
-
-            # Formater les données
-            users_data = []
-            for user in users:
-                users_data.append({
-                    'id': user.id,
-                    'name': user.name,
-                    'login': user.login,
-                    'email': user.email or '',
-                    'active': user.active,
-                    'company_id': user.company_id.id if user.company_id else None,
-                    'company_name': user.company_id.name if user.company_id else '',
-                    'image_url': f'/web/image/res.users/{user.id}/image_128' if user.image_128 else None,
-                })
+    def api_users(self, limit=USERS_DEFAULT_LIMIT, after=0, offset=0, fields=None, **kwargs):
+        """Retourne les utilisateurs au format JSON, page par page.
 
-            response_data = {
-                'success': True,
-                'data': users_data,
-                'count': len(users_data)
+        Pagination by keyset (after: last id of the previous page, see "next")
+        or offset; fields (comma separated) restricts the keys of each user.
+        The response is streamed, read in batches with its own cursor, so its
+        memory does not grow with limit.
+        """
+        try:
+            limit, after, offset = int(limit), int(after), int(offset)
+            field_names = [name for name in fields.split(',') if name] if fields else list(USER_API_FIELDS)
+            unknown = set(field_names) - set(USER_API_FIELDS)
+            if unknown or limit < 1 or after < 0 or offset < 0:
+                raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}' if unknown
+                                 else 'limit must be positive, after and offset must not be negative')
+        except ValueError as e:
+            error_response = {
+                'success': False,
+                'error': str(e)
             }
-
             return request.make_response(
-                json.dumps(response_data, ensure_ascii=False),
+                json.dumps(error_response),
                 headers=[
                     ('Content-Type', 'application/json'),
+                    ('Access-Control-Allow-Origin', '*')
+                ],
+                status=400
+            )
+
+        return request.make_response(
+            self._iter_users_json(request.env, field_names, limit, after, offset),
+            headers=[
+                ('Content-Type', 'application/json'),
+                ('Access-Control-Allow-Origin', '*'),
+                ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
+                ('Access-Control-Allow-Headers', 'Content-Type')
+            ]
+        )
+
+    def _iter_users_json(self, env, field_names, limit, after, offset):
+        """Generate the JSON of /api/users chunk by chunk.
+
+        Runs after the request cursor is closed, hence its own cursor; the
+        records of each batch are dropped from the cache once serialized.
+        """
+        with env.registry.cursor() as cr:
+            users_model = env(cr=cr, su=True)['res.users']
+            orm_fields = list({fname for name in field_names for fname in USER_API_FIELDS[name]})
+            yield b'{"success": true, "data": ['
+            count, last_id, has_more = 0, None, False
+            try:
+                while count < limit:
+                    domain = [('id', '>', last_id)] if last_id else ([('id', '>', after)] if after else [])
+                    batch_size = min(USERS_BATCH_SIZE, limit - count)
+                    # One more user tells whether anything follows this batch
+                    users = users_model.search_fetch(
+                        domain, orm_fields, order='id',
+                        offset=offset if last_id is None else 0, limit=batch_size + 1)
+                    has_more = len(users) > batch_size
+                    users = users[:batch_size]
+                    if not users:
+                        break
+                    with_avatar = self._get_users_with_avatar(users) if 'image_url' in field_names else set()
+                    rows = [
+                        json.dumps({name: self._get_user_value(user, name, with_avatar) for name in field_names},
+                                   ensure_ascii=False)
+                        for user in users
+                    ]
+                    yield (', ' if count else '').encode() + ', '.join(rows).encode()
+                    count += len(users)
+                    last_id = users[-1].id
+                    users_model.env.invalidate_all()
+                    if not has_more:
+                        break
+                next_after = last_id if has_more else None
+                yield f'], "count": {count}, "next": {json.dumps(next_after)}}}'.encode()
+            except Exception:
+                # Headers are already sent: the client gets a truncated document
+                _logger.exception("Streaming /api/users failed")
+                raise
+
+    def _get_users_with_avatar(self, users):
+        """Ids of the users having an avatar image, read without loading the images"""
+        attachments = users.env['ir.attachment'].search_fetch([
+            ('res_model', '=', 'res.partner'),
+            ('res_field', '=', 'image_128'),
+            ('res_id', 'in', users.partner_id.ids),
+        ], ['res_id'])
+        partner_ids = set(attachments.mapped('res_id'))
+        return {user.id for user in users if user.partner_id.id in partner_ids}
+
+    def _get_user_value(self, user, name, with_avatar):
+        if name == 'email':
+            return user.email or ''
+        if name == 'company_id':
+            return user.company_id.id or None
+        if name == 'company_name':
+            return user.company_id.name or ''
+        if name == 'image_url':
+            return f'/web/image/res.users/{user.id}/image_128' if user.id in with_avatar else None
+        return user[name]
+
+    # CMS API Routes
+    @http.route('/api/cms/pages', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
+    def api_cms_pages(self, navigation=None, after=None, limit=None, **kwargs):
+        """Retourne la liste des pages CMS actives.
+
+        navigation=1 keeps the pages shown in the navigation only; limit and
+        after (the "next" cursor of the previous response) paginate by
+        (sequence, id). The payload is cached per worker for the current
+        listing version. Format: see doc/api_formats.md.
+        """
+        try:
+            fmt = self._get_response_format(kwargs.get('format'))
+            if fmt is None:
+                return self._not_acceptable()
+            try:
+                navigation = navigation in ('1', 'true')
+                after = self._parse_pages_cursor(after)
+                limit = int(limit) if limit else None
+                if limit is not None and limit < 1:
+                    raise ValueError('limit must be positive')
+            except ValueError as e:
+                error_response = {
+                    'success': False,
+                    'error': str(e)
+                }
+                return request.make_response(
+                    json.dumps(error_response),
+                    headers=[
+                        ('Content-Type', 'application/json'),
+                        ('Access-Control-Allow-Origin', '*')
+                    ],
+                    status=400
+                )
+
+            version = request.env['cms.page'].sudo()._get_listing_version()
+            etag = f'pages-{version}-{int(navigation)}-{self._format_pages_cursor(after)}-{limit or 0}-{fmt}'
+            not_modified = self._not_modified('pages', etag)
+            if not_modified:
+                return not_modified
+
+            data, count, next_after = self._get_pages_payload(version, navigation, after, limit, fmt)
+            content = serializers.encode_map([
+                ('success', serializers.encode(True, fmt)),
+                ('data', data),
+                ('count', serializers.encode(count, fmt)),
+                ('next', serializers.encode(self._format_pages_cursor(next_after), fmt)),
+            ], fmt)
+
+            return request.make_response(
+                content,
+                headers=[
+                    ('Content-Type', serializers.FORMATS[fmt]),
                     ('Access-Control-Allow-Origin', '*'),
                     ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
-                    ('Access-Control-Allow-Headers', 'Content-Type')
-                ]
+                    ('Access-Control-Allow-Headers', 'Content-Type, Accept, If-None-Match, If-Modified-Since')
+                ] + self._validator_headers('pages', etag)
             )
         except Exception as e:
             error_response = {
@@ -126,33 +401,169 @@ class CmsFront(http.Controller):
                 status=500
             )
 
-    # CMS API Routes
-    @http.route('/api/cms/pages', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
-    def api_cms_pages(self, **kwargs):
-        """Retourne la liste de toutes les pages CMS"""
+    @http.route('/api/cms/page/<string:slug>', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
+    def api_cms_page(self, slug, lang='en_US', **kwargs):
+        """Retourne une page CMS avec tous ses blocs traduits (format : voir doc/api_formats.md)"""
         try:
-            pages = request.env['cms.page'].sudo().search([('active', '=', True)])
-            pages_data = [{
-                'id': page.id,
-                'name': page.name,
-                'slug': page.slug,
-                'title': page.title or page.name,
-            } for page in pages]
+            fmt = self._get_response_format(kwargs.get('format'))
+            if fmt is None:
+                return self._not_acceptable()
+            pages = request.env['cms.page'].sudo()
+            page_version = pages._get_page_version(slug)
 
-            response_data = {
-                'success': True,
-                'data': pages_data,
-                'count': len(pages_data)
+            if not page_version:
+                error_response = {
+                    'success': False,
+                    'error': f'Page "{slug}" not found'
+                }
+                return request.make_response(
+                    json.dumps(error_response),
+                    headers=[
+                        ('Content-Type', 'application/json'),
+                        ('Access-Control-Allow-Origin', '*')
+                    ],
+                    status=404
+                )
+
+            page_id = page_version['id']
+            version = page_version['content_version']
+            # User lists are live data, not covered by the page version
+            cacheable = not page_version['has_dynamic_blocks']
+
+            validator_headers = [('Vary', 'Accept')]
+            if cacheable:
+                etag = f'page-{page_id}-{version}-{lang}-{fmt}'
+                last_modified = page_version['content_date']
+                not_modified = self._not_modified('page', etag, last_modified, fmt)
+                if not_modified:
+                    return not_modified
+                validator_headers = self._validator_headers('page', etag, last_modified)
+
+            content = serializers.encode_map([
+                ('success', serializers.encode(True, fmt)),
+                ('data', self._get_page_payload(page_version, slug, lang, fmt)),
+            ], fmt)
+
+            return request.make_response(
+                content,
+                headers=[
+                    ('Content-Type', serializers.FORMATS[fmt]),
+                    ('Access-Control-Allow-Origin', '*'),
+                    ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
+                    ('Access-Control-Allow-Headers', 'Content-Type, Accept, If-None-Match, If-Modified-Since')
+                ] + validator_headers
+            )
+        except Exception as e:
+            error_response = {
+                'success': False,
+                'error': str(e)
             }
+            return request.make_response(
+                json.dumps(error_response),
+                headers=[
+                    ('Content-Type', 'application/json'),
+                    ('Access-Control-Allow-Origin', '*')
+                ],
+                status=500
+            )
 
+    def _get_pages_payload(self, version, navigation=False, after=None, limit=None, fmt='json'):
+        """Encoded page listing with its count and next cursor, from the worker cache when current"""
+        key = (request.env.cr.dbname, navigation, after, limit, fmt)
+        cached = listing_cache.get(key, version)
+        if cached is None:
+            pages_data, next_after = request.env['cms.page'].sudo().get_pages_list(
+                navigation=navigation, after=after, limit=limit)
+            cached = (serializers.encode(pages_data, fmt), len(pages_data), next_after)
+            listing_cache.put(key, version, cached)
+        return cached
+
+    def _parse_pages_cursor(self, cursor):
+        """'sequence,id' -> (sequence, id)"""
+        if not cursor:
+            return None
+        sequence, page_id = cursor.split(',')
+        return int(sequence), int(page_id)
+
+    def _format_pages_cursor(self, after):
+        return f'{after[0]},{after[1]}' if after else None
+
+    def _get_page_payload(self, page_version, slug, lang, fmt='json'):
+        """Encoded data of a page, from the worker cache when still current"""
+        pages = request.env['cms.page'].sudo()
+        page_id = page_version['id']
+        version = page_version['content_version']
+        # User lists are live data, not covered by the page version
+        cacheable = not page_version['has_dynamic_blocks']
+
+        dbname = request.env.cr.dbname
+        content = page_cache.get(dbname, slug, lang, page_id, version, fmt) if cacheable else None
+        if content is None:
+            content = serializers.encode(pages.browse(page_id).get_page_data(lang=lang), fmt)
+            if cacheable:
+                page_cache.put(dbname, slug, lang, page_id, version, content, fmt)
+        return content
+
+    @http.route('/api/cms/bootstrap/<string:slug>', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
+    def api_cms_bootstrap(self, slug, lang='en_US', fields=None, **kwargs):
+        """Retourne en une seule réponse la page, la navigation, les langues et les traductions.
+
+        fields (comma separated, default: all) selects the parts to return, so
+        a client can leave out what it already has.
+        """
+        try:
+            parts, unknown = self._get_bootstrap_parts(fields)
+            if unknown:
+                error_response = {
+                    'success': False,
+                    'error': f'Unknown fields: {", ".join(sorted(unknown))}'
+                }
+                return request.make_response(
+                    json.dumps(error_response),
+                    headers=[
+                        ('Content-Type', 'application/json'),
+                        ('Access-Control-Allow-Origin', '*')
+                    ],
+                    status=400
+                )
+
+            # Versions of the requested parts, computed before loading anything
+            page_version = request.env['cms.page'].sudo()._get_page_version(slug) if 'page' in parts else None
+            if 'page' in parts and not page_version:
+                error_response = {
+                    'success': False,
+                    'error': f'Page "{slug}" not found'
+                }
+                return request.make_response(
+                    json.dumps(error_response),
+                    headers=[
+                        ('Content-Type', 'application/json'),
+                        ('Access-Control-Allow-Origin', '*')
+                    ],
+                    status=404
+                )
+            listing_version = request.env['cms.page'].sudo()._get_listing_version() if 'pages' in parts else None
+
+            validators = self._get_bootstrap_validators(parts, page_version, listing_version)
+            validator_headers = []
+            if len(validators) == len(parts):
+                etag = '-'.join(['bootstrap', lang] + [f'{part}.{validators[part][0]}' for part in parts])
+                dates = [date for _token, date in validators.values() if date]
+                last_modified = max(dates) if dates else None
+                not_modified = self._not_modified('bootstrap', etag, last_modified)
+                if not_modified:
+                    return not_modified
+                validator_headers = self._validator_headers('bootstrap', etag, last_modified)
+
+            content = self._get_bootstrap_payload(parts, slug, lang, page_version, listing_version)
             return request.make_response(
-                json.dumps(response_data, ensure_ascii=False),
+                content,
                 headers=[
                     ('Content-Type', 'application/json'),
                     ('Access-Control-Allow-Origin', '*'),
                     ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
-                    ('Access-Control-Allow-Headers', 'Content-Type')
-                ]
+                    ('Access-Control-Allow-Headers', 'Content-Type, If-None-Match, If-Modified-Since')
+                ] + validator_headers
             )
         except Exception as e:
             error_response = {
@@ -168,16 +579,71 @@ class CmsFront(http.Controller):
                 status=500
             )
 
-    @http.route('/api/cms/page/<string:slug>', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
-    def api_cms_page(self, slug, lang='en_US', **kwargs):
-        """Retourne une page CMS avec tous ses blocs traduits"""
+    def _get_bootstrap_parts(self, fields):
+        """Parts selected by fields (comma separated, default: all), and the unknown ones"""
+        parts = [part for part in fields.split(',') if part] if fields else list(BOOTSTRAP_PARTS)
+        return parts, set(parts) - set(BOOTSTRAP_PARTS)
+
+    def _get_bootstrap_validators(self, parts, page_version, listing_version):
+        """Validators {part: (token, last modified)} of the requested parts that have one"""
+        translation_keys = request.env['cms.translation.key'].sudo()
+        validators = {}
+        # User lists are live data: no validator covers them
+        if 'page' in parts and not page_version['has_dynamic_blocks']:
+            validators['page'] = (f"{page_version['id']}.{page_version['content_version']}",
+                                  page_version['content_date'])
+        if 'pages' in parts:
+            validators['pages'] = (str(listing_version), None)
+        if 'translations' in parts:
+            _version, _count, last_modified = translation_keys._get_content_version()
+            validators['translations'] = (str(translation_keys._get_translations_version()), last_modified)
+        if 'languages' in parts:
+            count, last_modified = translation_keys._get_languages_version()
+            validators['languages'] = (f'{count}.{last_modified.timestamp() if last_modified else 0}', last_modified)
+        return validators
+
+    def _get_bootstrap_payload(self, parts, slug, lang, page_version, listing_version):
+        """JSON of the bootstrap response, assembled from already serialized parts"""
+        translation_keys = request.env['cms.translation.key'].sudo()
+        data = []
+        if 'page' in parts:
+            data.append(b'"page": ' + self._get_page_payload(page_version, slug, lang))
+        if 'pages' in parts:
+            data.append(b'"pages": ' + self._get_pages_payload(listing_version, navigation=True)[0])
+        if 'languages' in parts:
+            languages = translation_keys.get_available_languages()
+            data.append(b'"languages": ' + json.dumps(languages, ensure_ascii=False).encode())
+        if 'translations' in parts:
+            translations = translation_keys.get_translations(lang)
+            data.append(b'"translations": ' + json.dumps(translations, ensure_ascii=False).encode())
+        return b'{"success": true, "lang": ' + json.dumps(lang).encode() + b', "data": {' + b', '.join(data) + b'}}'
+
+    @http.route('/api/cms/block/<int:block_id>/users', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
+    def api_cms_block_users(self, block_id, offset=0, limit=None, **kwargs):
+        """Retourne une page des utilisateurs d'un bloc liste d'utilisateurs"""
         try:
-            page = request.env['cms.page'].sudo().search([('slug', '=', slug), ('active', '=', True)], limit=1)
+            offset = max(int(offset), 0)
+            limit = min(max(int(limit), 1), BLOCK_USERS_MAX_LIMIT) if limit else None
+        except ValueError:
+            error_response = {
+                'success': False,
+                'error': 'offset and limit must be integers'
+            }
+            return request.make_response(
+                json.dumps(error_response),
+                headers=[
+                    ('Content-Type', 'application/json'),
+                    ('Access-Control-Allow-Origin', '*')
+                ],
+                status=400
+            )
 
-            if not page:
+        try:
+            block = request.env['cms.block'].sudo().browse(block_id).exists()
+            if not block or block.block_type != 'user_list' or not block.active or not block.page_id.active:
                 error_response = {
                     'success': False,
-                    'error': f'Page "{slug}" not found'
+                    'error': f'User list block {block_id} not found'
                 }
                 return request.make_response(
                     json.dumps(error_response),
@@ -188,9 +654,12 @@ class CmsFront(http.Controller):
                     status=404
                 )
 
+            user_list = block._get_user_list_data(offset=offset, limit=limit or block.limit)
+
             response_data = {
                 'success': True,
-                'data': page.get_page_data(lang=lang)
+                'data': user_list['users'],
+                'next': user_list['next'],
             }
 
             return request.make_response(
@@ -199,7 +668,8 @@ class CmsFront(http.Controller):
                     ('Content-Type', 'application/json'),
                     ('Access-Control-Allow-Origin', '*'),
                     ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
-                    ('Access-Control-Allow-Headers', 'Content-Type')
+                    ('Access-Control-Allow-Headers', 'Content-Type'),
+                    ('Cache-Control', self._get_cache_control('block_users')),
                 ]
             )
         except Exception as e:
@@ -216,27 +686,108 @@ class CmsFront(http.Controller):
                 status=500
             )
 
-    # Translation API Routes
-    @http.route('/api/translations/<string:lang>', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
-    def api_translations(self, lang, **kwargs):
-        """Retourne toutes les traductions pour une langue donnée"""
+    @http.route('/api/cms/changes', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
+    def api_cms_changes(self, since=0, **kwargs):
+        """Retourne les pages, blocs et clés de traduction modifiés depuis le curseur since.
+
+        since is the "version" of the previous response. When it is missing or
+        older than the retained log, reset is true and data null: the client
+        reloads everything, then passes the returned version next time.
+        """
         try:
-            translations = request.env['cms.translation.key'].sudo().get_translations(lang)
+            fmt = self._get_response_format(kwargs.get('format'))
+            if fmt is None:
+                return self._not_acceptable()
+            try:
+                since = int(since)
+            except ValueError:
+                error_response = {
+                    'success': False,
+                    'error': f'Invalid cursor: {since}'
+                }
+                return request.make_response(
+                    json.dumps(error_response),
+                    headers=[
+                        ('Content-Type', 'application/json'),
+                        ('Access-Control-Allow-Origin', '*')
+                    ],
+                    status=400
+                )
 
+            changes = request.env['cms.content.change'].sudo()
+            cursor = changes._get_cursor()
+            etag = f'changes-{since}-{cursor}-{fmt}'
+            not_modified = self._not_modified('changes', etag)
+            if not_modified:
+                return not_modified
+
+            data = changes._get_changes(since, cursor)
             response_data = {
                 'success': True,
-                'data': translations,
-                'lang': lang
+                'version': cursor,
+                'reset': data is None,
+                'data': data,
             }
 
             return request.make_response(
-                json.dumps(response_data, ensure_ascii=False),
+                serializers.encode(response_data, fmt),
+                headers=[
+                    ('Content-Type', serializers.FORMATS[fmt]),
+                    ('Access-Control-Allow-Origin', '*'),
+                    ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
+                    ('Access-Control-Allow-Headers', 'Content-Type, Accept, If-None-Match')
+                ] + self._validator_headers('changes', etag)
+            )
+        except Exception as e:
+            error_response = {
+                'success': False,
+                'error': str(e)
+            }
+            return request.make_response(
+                json.dumps(error_response),
                 headers=[
                     ('Content-Type', 'application/json'),
+                    ('Access-Control-Allow-Origin', '*')
+                ],
+                status=500
+            )
+
+    # Translation API Routes
+    @http.route('/api/translations/<string:lang>', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
+    def api_translations(self, lang, **kwargs):
+        """Retourne toutes les traductions pour une langue donnée (format : voir doc/api_formats.md)"""
+        try:
+            fmt = self._get_response_format(kwargs.get('format'))
+            if fmt is None:
+                return self._not_acceptable()
+            translation_keys = request.env['cms.translation.key'].sudo()
+            version = translation_keys._get_translations_version()
+            _version, _count, last_modified = translation_keys._get_content_version()
+            etag = f'translations-{lang}-{version}-{fmt}'
+            not_modified = self._not_modified('translations', etag, last_modified, fmt)
+            if not_modified:
+                return not_modified
+
+            key = (request.env.cr.dbname, lang, fmt)
+            data = translations_cache.get(key, version)
+            if data is None:
+                data = serializers.encode(translation_keys.get_translations(lang), fmt)
+                translations_cache.put(key, version, data)
+
+            content = serializers.encode_map([
+                ('success', serializers.encode(True, fmt)),
+                ('data', data),
+                ('lang', serializers.encode(lang, fmt)),
+            ], fmt)
+
+            return request.make_response(
+                content,
+                headers=[
+                    ('Content-Type', serializers.FORMATS[fmt]),
                     ('Access-Control-Allow-Origin', '*'),
                     ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
-                    ('Access-Control-Allow-Headers', 'Content-Type')
-                ]
+                    ('Access-Control-Allow-Headers', 'Content-Type, Accept, If-None-Match, If-Modified-Since')
+                ] + self._validator_headers('translations', etag, last_modified)
             )
         except Exception as e:
             error_response = {
@@ -256,7 +807,14 @@ class CmsFront(http.Controller):
     def api_languages(self, **kwargs):
         """Retourne la liste des langues disponibles"""
         try:
-            languages = request.env['cms.translation.key'].sudo().get_available_languages()
+            translation_keys = request.env['cms.translation.key'].sudo()
+            count, last_modified = translation_keys._get_languages_version()
+            etag = f'languages-{count}-{last_modified.timestamp() if last_modified else 0}'
+            not_modified = self._not_modified('languages', etag, last_modified)
+            if not_modified:
+                return not_modified
+
+            languages = translation_keys.get_available_languages()
 
             response_data = {
                 'success': True,
@@ -270,8 +828,8 @@ class CmsFront(http.Controller):
                     ('Content-Type', 'application/json'),
                     ('Access-Control-Allow-Origin', '*'),
                     ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
-                    ('Access-Control-Allow-Headers', 'Content-Type')
-                ]
+                    ('Access-Control-Allow-Headers', 'Content-Type, If-None-Match, If-Modified-Since')
+                ] + self._validator_headers('languages', etag, last_modified)
             )
         except Exception as e:
             error_response = {
@@ -0,0 +1,28 @@
+from werkzeug.exceptions import NotFound
+
+from odoo import http
+from odoo.http import request
+from odoo.tools import config, str2bool
+
+
+class CmsFakeIap(http.Controller):
+    """Faux service de traduction IAP, pour les tests et le développement.
+
+    Only answers when the tests are enabled or the system parameter
+    cms_sarkande.fake_iap_enabled is set. Set cms_sarkande.translation_endpoint
+    to its absolute URL, e.g. http://localhost:8069/cms_sarkande/fake_iap/translate,
+    to use it instead of IAP.
+    """
+
+    def _is_enabled(self):
+        if config['test_enable']:
+            return True
+        return bool(request.db) and str2bool(
+            request.env['ir.config_parameter'].sudo().get_param('cms_sarkande.fake_iap_enabled', 'False'))
+
+    @http.route('/cms_sarkande/fake_iap/translate', type='jsonrpc', auth='none', csrf=False)
+    def translate(self, texts, source_language=None, target_language=None, **kwargs):
+        """Return each text prefixed with the target language code"""
+        if not self._is_enabled():
+            raise NotFound()
+        return [f'[{target_language}] {text}' for text in texts]
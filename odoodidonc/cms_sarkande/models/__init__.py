@@ -1,5 +1,11 @@
 from . import cms_translation_mixin
+from . import cms_content_version_mixin
+from . import cms_content_change
 from . import cms_page
+from . import cms_page_snapshot
+from . import cms_page_io
 from . import cms_block
 from . import cms_block_components
 from . import cms_translation
+from . import cms_translation_job
+from . import cms_translation_memory
@@ -1,4 +1,130 @@
+import ast
+from collections import defaultdict
+
 from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL, create_index, str2bool
+
+from odoo.addons.cms_sarkande.tools.page_cache import user_list_cache
+
+# Component many2one fields of cms.block, grouped by component model
+COMPONENT_FIELDS = {
+    'cms.block.html': ['html_component_id'],
+    'cms.block.text': ['text_component_id'],
+    'cms.block.title': ['heading_title_id', 'hero_title_id', 'hero_subtitle_id', 'hero_button_text_id'],
+    'cms.block.image': ['image_component_id'],
+    'cms.block.content': ['content_id'],
+}
+
+# Content fields read from each component model
+COMPONENT_VALUE_FIELDS = {
+    'cms.block.html': ['content'],
+    'cms.block.text': ['content'],
+    'cms.block.title': ['title'],
+    'cms.block.image': ['url', 'alt'],
+    'cms.block.content': ['title', 'subtitle', 'button_text', 'text', 'html', 'image_url', 'image_alt'],
+}
+
+# Content fields of a block -> (field of its cms.block.content, or
+# many2one to its original component and field of that component)
+CONTENT_FIELDS = {
+    'html_content': ('html', 'html_component_id', 'content'),
+    'text_content': ('text', 'text_component_id', 'content'),
+    'heading_text': ('title', 'heading_title_id', 'title'),
+    'image_url': ('image_url', 'image_component_id', 'url'),
+    'image_alt': ('image_alt', 'image_component_id', 'alt'),
+    'hero_title': ('title', 'hero_title_id', 'title'),
+    'hero_subtitle': ('subtitle', 'hero_subtitle_id', 'title'),
+    'hero_button_text': ('button_text', 'hero_button_text_id', 'title'),
+}
+
+# Content fields of each block type
+BLOCK_TYPE_CONTENT_FIELDS = {
+    'html': ['html_content'],
+    'text': ['text_content'],
+    'heading': ['heading_text'],
+    'image': ['image_url', 'image_alt'],
+    'hero': ['hero_title', 'hero_subtitle', 'hero_button_text'],
+}
+
+# Original components of each block type, created empty when the type is chosen
+BLOCK_TYPE_COMPONENT_FIELDS = {
+    'html': ['html_component_id'],
+    'text': ['text_component_id'],
+    'heading': ['heading_title_id'],
+    'image': ['image_component_id'],
+    'hero': ['hero_title_id', 'hero_subtitle_id', 'hero_button_text_id'],
+}
+
+# Translatable content fields of each block type, with their label in the translation wizard
+TRANSLATABLE_CONTENT_FIELDS = {
+    'html': [('HTML Content', 'html_content')],
+    'text': [('Text Content', 'text_content')],
+    'heading': [('Heading', 'heading_text')],
+    'hero': [('Hero Title', 'hero_title'), ('Hero Subtitle', 'hero_subtitle'), ('Button Text', 'hero_button_text')],
+    'image': [('Alt Text', 'image_alt')],
+}
+
+# Many2one fields to the original, one record per field, components
+LEGACY_COMPONENT_FIELDS = [
+    fname for model_name, fnames in COMPONENT_FIELDS.items() if model_name != 'cms.block.content' for fname in fnames
+]
+
+# Every component many2one field of cms.block
+COMPONENT_FIELDS_FLAT = LEGACY_COMPONENT_FIELDS + COMPONENT_FIELDS['cms.block.content']
+
+# Columns never copied by copy_rows()
+COPY_SKIPPED_COLUMNS = ('id', 'create_uid', 'create_date', 'write_uid', 'write_date')
+
+
+def copy_rows(model, ids, overrides=None):
+    """Copy rows of the table of model, all columns and languages included, with one INSERT.
+
+    overrides maps column names to {source id: value} for the columns whose
+    value changes in the copies. Returns {source id: copy id}. The caller
+    flushes before and invalidates the cache after.
+    """
+    ids = tuple(sorted(set(ids)))
+    if not ids:
+        return {}
+    overrides = overrides or {}
+    cr = model.env.cr
+    cr.execute(SQL(
+        "SELECT id, nextval(pg_get_serial_sequence(%s, 'id')) FROM %s WHERE id IN %s",
+        model._table, SQL.identifier(model._table), ids,
+    ))
+    mapping = dict(cr.fetchall())
+    if not mapping:
+        return {}
+
+    columns = [
+        fname for fname, field in model._fields.items()
+        if field.store and field.column_type and fname not in COPY_SKIPPED_COLUMNS and fname not in overrides
+    ]
+    override_columns = list(overrides)
+    values = SQL(', ').join(
+        SQL('(%s)', SQL(', ').join([SQL('%s', source_id), SQL('%s', copy_id)] + [
+            SQL(f'%s::{model._fields[fname].column_type[1]}', overrides[fname].get(source_id))
+            for fname in override_columns
+        ]))
+        for source_id, copy_id in mapping.items()
+    )
+    cr.execute(SQL(
+        """INSERT INTO %(table)s (id, %(columns)s, create_uid, create_date, write_uid, write_date)
+           SELECT v.new_id, %(selected)s, %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+             FROM (VALUES %(values)s) AS v(old_id, new_id%(aliases)s)
+             JOIN %(table)s t ON t.id = v.old_id""",
+        table=SQL.identifier(model._table),
+        columns=SQL(', ').join(SQL.identifier(fname) for fname in columns + override_columns),
+        selected=SQL(', ').join(
+            [SQL.identifier('t', fname) for fname in columns]
+            + [SQL.identifier('v', fname) for fname in override_columns]
+        ),
+        uid=model.env.uid,
+        values=values,
+        aliases=SQL('').join(SQL(', %s', SQL.identifier(fname)) for fname in override_columns),
+    ))
+    return mapping
 
 
 class CmsBlock(models.Model):
@@ -20,12 +146,16 @@ class CmsBlock(models.Model):
     sequence = fields.Integer(string='Sequence', default=10)
     active = fields.Boolean(string='Active', default=True)
 
+    # Compact storage: all the content of the block in one record
+    content_id = fields.Many2one('cms.block.content', string='Content', ondelete='cascade', index='btree_not_null',
+                                 help='Content of the block in compact storage, replacing the components below')
+
     # Component references (content with translations)
-    html_component_id = fields.Many2one('cms.block.html', string='HTML Component', ondelete='cascade')
-    text_component_id = fields.Many2one('cms.block.text', string='Text Component', ondelete='cascade')
+    html_component_id = fields.Many2one('cms.block.html', string='HTML Component', ondelete='cascade', index='btree_not_null')
+    text_component_id = fields.Many2one('cms.block.text', string='Text Component', ondelete='cascade', index='btree_not_null')
 
     # Heading components
-    heading_title_id = fields.Many2one('cms.block.title', string='Heading', ondelete='cascade')
+    heading_title_id = fields.Many2one('cms.block.title', string='Heading', ondelete='cascade', index='btree_not_null')
     heading_level = fields.Selection([
         ('h1', 'H1'),
         ('h2', 'H2'),
@@ -34,120 +164,449 @@ class CmsBlock(models.Model):
     ], string='Heading Level', default='h2')
 
     # Image component
-    image_component_id = fields.Many2one('cms.block.image', string='Image Component', ondelete='cascade')
+    image_component_id = fields.Many2one('cms.block.image', string='Image Component', ondelete='cascade', index='btree_not_null')
 
     # Hero section components
-    hero_title_id = fields.Many2one('cms.block.title', string='Hero Title', ondelete='cascade')
-    hero_subtitle_id = fields.Many2one('cms.block.title', string='Hero Subtitle', ondelete='cascade')
-    hero_button_text_id = fields.Many2one('cms.block.title', string='Button Text', ondelete='cascade')
+    hero_title_id = fields.Many2one('cms.block.title', string='Hero Title', ondelete='cascade', index='btree_not_null')
+    hero_subtitle_id = fields.Many2one('cms.block.title', string='Hero Subtitle', ondelete='cascade', index='btree_not_null')
+    hero_button_text_id = fields.Many2one('cms.block.title', string='Button Text', ondelete='cascade', index='btree_not_null')
     hero_button_url = fields.Char(string='Button URL')
     hero_background_image = fields.Char(string='Background Image URL')
 
     # Dynamic content config
     limit = fields.Integer(string='Limit', default=10,
                           help='Number of items to display for dynamic blocks')
+    user_domain = fields.Char(string='Users Filter', default='[]',
+                              help='Domain on res.users selecting the users of a user list')
+    user_order = fields.Selection([
+        ('name', 'Name'),
+        ('login', 'Login'),
+        ('create_date desc', 'Newest First'),
+        ('id', 'ID'),
+    ], string='Users Order', default='name')
+
+    # Copy-on-write clones (cms.page._clone)
+    shared_components = fields.Boolean(string='Shared Components', readonly=True, copy=False,
+                                       help='The components of this block are shared with its clones; '
+                                            'they are copied before its content is first edited')
+
+    # Fields for easier editing, read from and written to the content or the components
+    html_content = fields.Html(string='HTML Content', compute='_compute_content_fields',
+                               inverse='_inverse_content_fields')
+    text_content = fields.Text(string='Text Content', compute='_compute_content_fields',
+                               inverse='_inverse_content_fields')
+    heading_text = fields.Char(string='Heading Text', compute='_compute_content_fields',
+                               inverse='_inverse_content_fields')
+    image_url = fields.Char(string='Image URL', compute='_compute_content_fields',
+                            inverse='_inverse_content_fields')
+    image_alt = fields.Char(string='Alt Text', compute='_compute_content_fields',
+                            inverse='_inverse_content_fields')
+    hero_title = fields.Char(string='Hero Title', compute='_compute_content_fields',
+                             inverse='_inverse_content_fields')
+    hero_subtitle = fields.Char(string='Hero Subtitle', compute='_compute_content_fields',
+                                inverse='_inverse_content_fields')
+    hero_button_text = fields.Char(string='Button Text', compute='_compute_content_fields',
+                                   inverse='_inverse_content_fields')
+
+    def init(self):
+        super().init()
+        # Blocks of a page in display order (get_pages_data, page deletion)
+        create_index(self.env.cr, 'cms_block_page_active_sequence_index', self._table,
+                     ['page_id', 'active', 'sequence', 'id'])
+        # Pages showing live data (cms.page._get_page_version, snapshots)
+        create_index(self.env.cr, 'cms_block_page_user_list_index', self._table,
+                     ['page_id'], where="active AND block_type = 'user_list'")
+
+    @api.depends_context('lang')
+    @api.depends('block_type',
+                 *(f'content_id.{content_field}' for content_field, _m2o, _field in CONTENT_FIELDS.values()),
+                 *(f'{m2o}.{field}' for _content_field, m2o, field in CONTENT_FIELDS.values()))
+    def _compute_content_fields(self):
+        for block in self:
+            for fname in CONTENT_FIELDS:
+                component, component_field = block._get_content_component(fname)
+                block[fname] = component[component_field] if component else False
+
+    def _inverse_content_fields(self):
+        self._detach_shared_components()
+        for block in self:
+            values = {}
+            for fname in BLOCK_TYPE_CONTENT_FIELDS.get(block.block_type, []):
+                component, component_field = block._get_content_component(fname)
+                if component and component[component_field] != block[fname]:
+                    values.setdefault(component, {})[component_field] = block[fname]
+            for component, component_values in values.items():
+                component.write(component_values)
+
+    def _get_content_component(self, fname):
+        """(record, field) holding a content field of the block: its compact content, or its component"""
+        content_field, component_m2o, component_field = CONTENT_FIELDS[fname]
+        if self.content_id:
+            return self.content_id, content_field
+        return self[component_m2o], component_field
+
+    def _get_content_value(self, fname):
+        component, component_field = self._get_content_component(fname)
+        return component[component_field] if component else ''
 
-    # Related fields for easier editing (these are the actual translatable fields)
-    html_content = fields.Html(related='html_component_id.content', string='HTML Content', readonly=False, store=False)
-    text_content = fields.Text(related='text_component_id.content', string='Text Content', readonly=False, store=False)
-    heading_text = fields.Char(related='heading_title_id.title', string='Heading Text', readonly=False, store=False)
-    image_url = fields.Char(related='image_component_id.url', string='Image URL', readonly=False, store=False)
-    image_alt = fields.Char(related='image_component_id.alt', string='Alt Text', readonly=False, store=False)
-    hero_title = fields.Char(related='hero_title_id.title', string='Hero Title', readonly=False, store=False)
-    hero_subtitle = fields.Char(related='hero_subtitle_id.title', string='Hero Subtitle', readonly=False, store=False)
-    hero_button_text = fields.Char(related='hero_button_text_id.title', string='Button Text', readonly=False, store=False)
+    @api.model
+    def _use_compact_storage(self):
+        """Whether new blocks store their content in one cms.block.content (cms_sarkande.compact_storage)"""
+        return str2bool(self.env['ir.config_parameter'].sudo().get_param('cms_sarkande.compact_storage', 'False'))
 
     @api.onchange('block_type')
     def _onchange_block_type(self):
         """Auto-create component records when block type changes"""
-        if self.block_type == 'html' and not self.html_component_id:
-            self.html_component_id = self.env['cms.block.html'].create({})
-        elif self.block_type == 'text' and not self.text_component_id:
-            self.text_component_id = self.env['cms.block.text'].create({})
-        elif self.block_type == 'heading' and not self.heading_title_id:
-            self.heading_title_id = self.env['cms.block.title'].create({})
-        elif self.block_type == 'image' and not self.image_component_id:
-            self.image_component_id = self.env['cms.block.image'].create({})
-        elif self.block_type == 'hero':
-            if not self.hero_title_id:
-                self.hero_title_id = self.env['cms.block.title'].create({})
-            if not self.hero_subtitle_id:
-                self.hero_subtitle_id = self.env['cms.block.title'].create({})
-            if not self.hero_button_text_id:
-                self.hero_button_text_id = self.env['cms.block.title'].create({})
+        if self.content_id or self.block_type not in BLOCK_TYPE_CONTENT_FIELDS:
+            return
+        if self._use_compact_storage() and not any(self[fname] for fname in LEGACY_COMPONENT_FIELDS):
+            self.content_id = self.env['cms.block.content'].create({})
+            return
+        for fname in BLOCK_TYPE_COMPONENT_FIELDS[self.block_type]:
+            if not self[fname]:
+                self[fname] = self.env[self._fields[fname].comodel_name].create({})
 
     @api.model_create_multi
     def create(self, vals_list):
         """Auto-create components when creating blocks"""
-        for vals in vals_list:
-            block_type = vals.get('block_type')
-            if block_type == 'html' and 'html_component_id' not in vals:
-                vals['html_component_id'] = self.env['cms.block.html'].create({}).id
-            elif block_type == 'text' and 'text_component_id' not in vals:
-                vals['text_component_id'] = self.env['cms.block.text'].create({}).id
-            elif block_type == 'heading' and 'heading_title_id' not in vals:
-                vals['heading_title_id'] = self.env['cms.block.title'].create({}).id
-            elif block_type == 'image' and 'image_component_id' not in vals:
-                vals['image_component_id'] = self.env['cms.block.image'].create({}).id
-            elif block_type == 'hero':
-                if 'hero_title_id' not in vals:
-                    vals['hero_title_id'] = self.env['cms.block.title'].create({}).id
-                if 'hero_subtitle_id' not in vals:
-                    vals['hero_subtitle_id'] = self.env['cms.block.title'].create({}).id
-                if 'hero_button_text_id' not in vals:
-                    vals['hero_button_text_id'] = self.env['cms.block.title'].create({}).id
-        return super().create(vals_list)
+        self._create_components(vals_list)
+        blocks = super().create(vals_list)
+        blocks._invalidate_page_cache()
+        return blocks
+
+    @api.model
+    def _create_components(self, vals_list):
+        """Create the missing components of new blocks, one create per component model.
+
+        The content values given for a block (hero_title, image_url...) go
+        straight into the component holding them. Fills the component
+        many2one fields of each vals, or content_id in compact storage.
+        """
+        compact = self._use_compact_storage()
+        # (index of the block vals, many2one field) -> values of the component
+        components = {}
+        for index, vals in enumerate(vals_list):
+            fnames = BLOCK_TYPE_CONTENT_FIELDS.get(vals.get('block_type'), [])
+            if not fnames or vals.get('content_id'):
+                continue
+            use_content = compact and not any(fname in vals for fname in LEGACY_COMPONENT_FIELDS)
+            for fname in fnames:
+                content_field, component_m2o, component_field = CONTENT_FIELDS[fname]
+                m2o, field = ('content_id', content_field) if use_content else (component_m2o, component_field)
+                if m2o in vals:
+                    continue
+                component_vals = components.setdefault((index, m2o), {})
+                if fname in vals:
+                    component_vals[field] = vals.pop(fname)
+
+        by_model = defaultdict(list)
+        for (index, m2o), component_vals in components.items():
+            by_model[self._fields[m2o].comodel_name].append((index, m2o, component_vals))
+        for model_name, items in by_model.items():
+            records = self.env[model_name].create([component_vals for _index, _m2o, component_vals in items])
+            for record, (index, m2o, _component_vals) in zip(records, items):
+                vals_list[index][m2o] = record.id
+
+    def write(self, vals):
+        pages = self.page_id
+        res = super().write(vals)
+        (pages | self.page_id)._invalidate_page_cache()
+        self._log_content_change()
+        return res
+
+    def unlink(self):
+        self._invalidate_page_cache()
+        return super().unlink()
+
+    def _invalidate_page_cache(self):
+        """Bump the content version of the blocks' pages and log the blocks as changed"""
+        self.page_id._invalidate_page_cache()
+        self._log_content_change()
+
+    def _log_content_change(self):
+        """Log the blocks in the content change log (/api/cms/changes)"""
+        self.env['cms.content.change']._log(self._name, [(block.id, None) for block in self])
+
+    @api.constrains('user_domain')
+    def _check_user_domain(self):
+        for block in self:
+            try:
+                domain = ast.literal_eval(block.user_domain or '[]')
+                self.env['res.users'].sudo()._search(domain)
+            except Exception as e:
+                raise ValidationError(f'Invalid users filter on block "{block.name}": {e}')
+
+    def _get_user_list_data(self, offset=0, limit=None):
+        """Return one page of the users of a user list block.
+
+        Results are kept for cms_sarkande.user_list_ttl seconds (60 by default)
+        in a per-worker cache shared by all requests, keyed by filter, order
+        and page. Only limit + 1 users are read, so the cost does not depend on
+        the size of the users table. Returns {'users': [...], 'next': offset of
+        the next page or None}.
+        """
+        self.ensure_one()
+        limit = limit or self.limit or 10
+        domain = self.user_domain or '[]'
+        order = self.user_order or 'name'
+        key = (self.env.cr.dbname, domain, order, offset, limit)
+        data = user_list_cache.get(key)
+        if data is None:
+            users = self.env['res.users'].sudo().search_fetch(
+                ast.literal_eval(domain), ['name', 'login', 'email', 'active'],
+                order=f'{order}, id', offset=offset, limit=limit + 1)
+            data = {
+                'users': [{
+                    'id': user.id,
+                    'name': user.name,
+                    'login': user.login,
+                    'email': user.email or '',
+                    'active': user.active,
+                } for user in users[:limit]],
+                'next': offset + limit if len(users) > limit else None,
+            }
+            ttl = float(self.env['ir.config_parameter'].sudo().get_param('cms_sarkande.user_list_ttl', 60))
+            user_list_cache.put(key, data, ttl)
+        return data
+
+    def _get_translatable_fields(self):
+        """Get translatable component fields of this block"""
+        self.ensure_one()
+        fields_list = []
+        for label, fname in TRANSLATABLE_CONTENT_FIELDS.get(self.block_type, []):
+            component, component_field = self._get_content_component(fname)
+            if component:
+                fields_list.append({
+                    'label': label,
+                    'component': component,
+                    'field': component_field,
+                })
+        return fields_list
+
+    def _fetch_components(self):
+        """Load every component of the blocks in the context language, one query per component model"""
+        component_fields = [fname for fnames in COMPONENT_FIELDS.values() for fname in fnames]
+        self.fetch(['block_type'] + component_fields)
+        for model_name, fnames in COMPONENT_FIELDS.items():
+            components = self.env[model_name]
+            for fname in fnames:
+                components |= self.mapped(fname)
+            components.fetch(COMPONENT_VALUE_FIELDS[model_name])
 
     def get_block_data(self, lang='en_US'):
         """Return block data formatted for API consumption with translations"""
         self.ensure_one()
+        return self._get_blocks_data(lang=lang)[self.id]
+
+    def _get_blocks_data(self, lang='en_US'):
+        """Serialize a recordset of blocks for API consumption.
 
+        Blocks and their components are fetched once per model in the target
+        language, so the number of queries does not depend on the number of
+        blocks. Returns a dict {block_id: block_data}.
+        """
         # Set context language for translate=True fields
-        record = self.with_context(lang=lang)
+        blocks = self.with_context(lang=lang)
+        blocks.fetch([
+            'name', 'block_type', 'sequence', 'heading_level', 'limit', 'user_domain', 'user_order',
+            'hero_button_url', 'hero_background_image',
+        ])
+        blocks._fetch_components()
+
+        result = {}
+        for record in blocks:
+            base_data = {
+                'id': record.id,
+                'name': record.name,
+                'type': record.block_type,
+                'sequence': record.sequence,
+            }
+
+            # Add type-specific data (translations handled by translate=True on components)
+            # Content read from the compact content of the block, or from its components
+            if record.block_type == 'html':
+                base_data['content'] = record._get_content_value('html_content')
+
+            elif record.block_type == 'text':
+                base_data['content'] = record._get_content_value('text_content')
+
+            elif record.block_type == 'heading':
+                base_data['text'] = record._get_content_value('heading_text')
+                base_data['level'] = record.heading_level or 'h2'
+
+            elif record.block_type == 'image':
+                base_data['url'] = record._get_content_value('image_url') or ''
+                base_data['alt'] = record._get_content_value('image_alt') or ''
+
+            elif record.block_type == 'hero':
+                base_data['title'] = record._get_content_value('hero_title')
+                base_data['subtitle'] = record._get_content_value('hero_subtitle')
+                base_data['buttonText'] = record._get_content_value('hero_button_text')
+                base_data['buttonUrl'] = record.hero_button_url or ''
+                base_data['backgroundImage'] = record.hero_background_image or ''
+
+            elif record.block_type == 'user_list':
+                # First page of users, from the short-lived shared cache
+                user_list = record._get_user_list_data()
+                base_data['users'] = user_list['users']
+                base_data['limit'] = record.limit
+                base_data['next'] = user_list['next']
 
-        base_data = {
-            'id': record.id,
-            'name': record.name,
-            'type': record.block_type,
-            'sequence': record.sequence,
+            result[record.id] = base_data
+
+        return result
+
+    def _convert_to_compact_storage(self):
+        """Move the content of the blocks from their components to one cms.block.content each.
+
+        Set-based: one INSERT for all the contents, copying the translated
+        JSONB columns as they are, and one UPDATE of the blocks. Components no
+        longer used by any block are deleted. Returns the number of blocks
+        converted.
+        """
+        for model_name in COMPONENT_FIELDS:
+            self.env[model_name].flush_model()
+        self.flush_model()
+        ids = tuple(id_ for id_ in self.ids if isinstance(id_, int))
+        if not ids:
+            return 0
+
+        cr = self.env.cr
+        cr.execute(SQL(
+            """SELECT id, nextval('cms_block_content_id_seq'), %s
+                 FROM cms_block
+                WHERE id IN %s AND content_id IS NULL AND block_type IN %s""",
+            SQL(', ').join(SQL.identifier(fname) for fname in LEGACY_COMPONENT_FIELDS),
+            ids, tuple(BLOCK_TYPE_CONTENT_FIELDS),
+        ))
+        rows = cr.fetchall()
+        if not rows:
+            return 0
+
+        values = SQL(', ').join(SQL('(%s, %s)', block_id, content_id) for block_id, content_id, *_ in rows)
+        cr.execute(SQL("""
+            INSERT INTO cms_block_content
+                   (id, title, subtitle, button_text, text, html, image_url, image_alt,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT v.content_id,
+                   CASE b.block_type WHEN 'heading' THEN heading.title WHEN 'hero' THEN hero_title.title END,
+                   CASE WHEN b.block_type = 'hero' THEN hero_subtitle.title END,
+                   CASE WHEN b.block_type = 'hero' THEN hero_button.title END,
+                   CASE WHEN b.block_type = 'text' THEN text_component.content END,
+                   CASE WHEN b.block_type = 'html' THEN html_component.content END,
+                   CASE WHEN b.block_type = 'image' THEN image.url END,
+                   CASE WHEN b.block_type = 'image' THEN image.alt END,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM (VALUES %(values)s) AS v(block_id, content_id)
+              JOIN cms_block b ON b.id = v.block_id
+         LEFT JOIN cms_block_html html_component ON html_component.id = b.html_component_id
+         LEFT JOIN cms_block_text text_component ON text_component.id = b.text_component_id
+         LEFT JOIN cms_block_title heading ON heading.id = b.heading_title_id
+         LEFT JOIN cms_block_image image ON image.id = b.image_component_id
+         LEFT JOIN cms_block_title hero_title ON hero_title.id = b.hero_title_id
+         LEFT JOIN cms_block_title hero_subtitle ON hero_subtitle.id = b.hero_subtitle_id
+         LEFT JOIN cms_block_title hero_button ON hero_button.id = b.hero_button_text_id
+        """, uid=self.env.uid, values=values))
+        cr.execute(SQL(
+            """UPDATE cms_block b
+                  SET content_id = v.content_id, shared_components = false, %s
+                 FROM (VALUES %s) AS v(block_id, content_id)
+                WHERE b.id = v.block_id""",
+            SQL(', ').join(SQL('%s = NULL', SQL.identifier(fname)) for fname in LEGACY_COMPONENT_FIELDS),
+            values,
+        ))
+
+        # Components of the converted blocks that no other block uses
+        self._delete_unused_components({
+            model_name: {row[2 + LEGACY_COMPONENT_FIELDS.index(fname)] for row in rows for fname in fnames}
+            for model_name, fnames in COMPONENT_FIELDS.items() if model_name != 'cms.block.content'
+        })
+
+        self.invalidate_model()
+        self.env['cms.block.content'].invalidate_model()
+        return len(rows)
+
+    def action_convert_to_compact_storage(self):
+        """Convertit les blocs sélectionnés au stockage compact"""
+        count = self._convert_to_compact_storage()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Stockage compact',
+                'message': f'{count} block(s) converted',
+                'type': 'success',
+            },
         }
 
-        # Add type-specific data (translations handled by translate=True on components)
-        if record.block_type == 'html':
-            base_data['content'] = record.html_component_id.content if record.html_component_id else ''
-
-        elif record.block_type == 'text':
-            base_data['content'] = record.text_component_id.content if record.text_component_id else ''
-
-        elif record.block_type == 'heading':
-            base_data['text'] = record.heading_title_id.title if record.heading_title_id else ''
-            base_data['level'] = record.heading_level or 'h2'
-
-        elif record.block_type == 'image':
-            if record.image_component_id:
-                base_data['url'] = record.image_component_id.url or ''
-                base_data['alt'] = record.image_component_id.alt or ''
-            else:
-                base_data['url'] = ''
-                base_data['alt'] = ''
-
-        elif record.block_type == 'hero':
-            base_data['title'] = record.hero_title_id.title if record.hero_title_id else ''
-            base_data['subtitle'] = record.hero_subtitle_id.title if record.hero_subtitle_id else ''
-            base_data['buttonText'] = record.hero_button_text_id.title if record.hero_button_text_id else ''
-            base_data['buttonUrl'] = record.hero_button_url or ''
-            base_data['backgroundImage'] = record.hero_background_image or ''
-
-        elif record.block_type == 'user_list':
-            # Fetch dynamic user data
-            users = record.env['res.users'].sudo().search([], limit=record.limit)
-            base_data['users'] = [{
-                'id': user.id,
-                'name': user.name,
-                'login': user.login,
-                'email': user.email or '',
-                'active': user.active,
-            } for user in users]
-            base_data['limit'] = record.limit
-
-        return base_data
+    def _unlink_with_components(self):
+        """Delete the blocks and their components that no other block uses.
+
+        Deletion only cascades from the components to the blocks, so a plain
+        unlink leaves the components behind.
+        """
+        component_ids = {
+            model_name: {id_ for fname in fnames for id_ in self[fname].ids}
+            for model_name, fnames in COMPONENT_FIELDS.items()
+        }
+        self.unlink()
+        self._delete_unused_components(component_ids)
+
+    @api.model
+    def _delete_unused_components(self, component_ids):
+        """Delete the given components, {model name: ids}, that no block references anymore"""
+        self.flush_model(list(COMPONENT_FIELDS_FLAT))
+        for model_name, ids in component_ids.items():
+            ids = tuple(ids - {None, False})
+            if not ids:
+                continue
+            self.env[model_name].flush_model()
+            self.env.cr.execute(SQL(
+                """DELETE FROM %s c
+                    WHERE c.id IN %s
+                      AND NOT EXISTS(SELECT 1 FROM cms_block b WHERE c.id IN (%s))""",
+                SQL.identifier(self.env[model_name]._table), ids,
+                SQL(', ').join(SQL('b.%s', SQL.identifier(fname)) for fname in COMPONENT_FIELDS[model_name]),
+            ))
+            self.env[model_name].invalidate_model()
+
+    def _detach_shared_components(self):
+        """Give blocks sharing their components (copy-on-write clones) their own copy of them.
+
+        One INSERT per component model and one UPDATE of the blocks; the
+        content does not change, so the page caches stay valid. Originals no
+        block uses anymore are deleted.
+        """
+        blocks = self.filtered('shared_components')
+        if not blocks:
+            return
+        for model_name in COMPONENT_FIELDS:
+            self.env[model_name].flush_model()
+        self.flush_model(list(COMPONENT_FIELDS_FLAT) + ['shared_components'])
+
+        copies, originals = {}, {}
+        for model_name, fnames in COMPONENT_FIELDS.items():
+            originals[model_name] = {block[fname].id for block in blocks for fname in fnames} - {False}
+            mapping = copy_rows(self.env[model_name], originals[model_name])
+            for block in blocks:
+                for fname in fnames:
+                    copies[block.id, fname] = mapping.get(block[fname].id)
+
+        self.env.cr.execute(SQL(
+            """UPDATE cms_block b
+                  SET shared_components = false, %s
+                 FROM (VALUES %s) AS v(id, %s)
+                WHERE b.id = v.id""",
+            SQL(', ').join(SQL('%s = %s', SQL.identifier(fname), SQL.identifier('v', fname))
+                           for fname in COMPONENT_FIELDS_FLAT),
+            SQL(', ').join(
+                SQL('(%s)', SQL(', ').join([SQL('%s', block.id)] + [
+                    SQL('%s::int4', copies[block.id, fname]) for fname in COMPONENT_FIELDS_FLAT
+                ]))
+                for block in blocks
+            ),
+            SQL(', ').join(SQL.identifier(fname) for fname in COMPONENT_FIELDS_FLAT),
+        ))
+        blocks.invalidate_recordset(list(COMPONENT_FIELDS_FLAT) + ['shared_components'])
+        # Originals that every block sharing them has now replaced by a copy
+        self._delete_unused_components(originals)
@@ -1,10 +1,60 @@
-from odoo import models, fields
+from odoo import models, fields, api
+
+from .cms_block import COMPONENT_FIELDS
+
+
+class CmsBlockComponent(models.AbstractModel):
+    """Base des composants - traductions et invalidation du cache des pages"""
+    _name = 'cms.block.component'
+    _inherit = ['cms.translation.mixin']
+    _description = 'CMS Block Component'
+
+    def _get_blocks(self):
+        """Return the blocks (archived included) referencing these components"""
+        fnames = COMPONENT_FIELDS[self._name]
+        domain = ['|'] * (len(fnames) - 1) + [(fname, 'in', self.ids) for fname in fnames]
+        return self.env['cms.block'].sudo().with_context(active_test=False).search(domain)
+
+    def _detach_shared_blocks(self):
+        """Copy-on-write: give the other blocks sharing these components their own copy of them.
+
+        Each component is left to the block with the lowest id (the original
+        of a copy-on-write clone), which the change then applies to alone.
+        """
+        blocks = self._get_blocks().filtered('shared_components')
+        fnames = COMPONENT_FIELDS[self._name]
+        detached = blocks.browse()
+        for component in self:
+            sharing = blocks.filtered(lambda block: any(block[fname] == component for fname in fnames))
+            detached |= sharing - sharing.sorted('id')[:1]
+        detached._detach_shared_components()
+
+    def write(self, vals):
+        self._detach_shared_blocks()
+        res = super().write(vals)
+        self._get_blocks()._invalidate_page_cache()
+        return res
+
+    @api.model
+    def update_field_translations_multi(self, values):
+        values = list(values)
+        self.browse({value[0] for value in values})._detach_shared_blocks()
+        return super().update_field_translations_multi(values)
+
+    def _translations_updated(self):
+        super()._translations_updated()
+        self._get_blocks()._invalidate_page_cache()
+
+    def unlink(self):
+        # Blocks are removed by the database cascade, collect them first
+        self._get_blocks()._invalidate_page_cache()
+        return super().unlink()
 
 
 class CmsBlockTitle(models.Model):
     """Composant titre - réutilisable avec translate=True"""
     _name = 'cms.block.title'
-    _inherit = ['cms.translation.mixin']
+    _inherit = ['cms.block.component']
     _description = 'CMS Block Title Component'
 
     title = fields.Char(string='Title', translate=True)
@@ -13,7 +63,7 @@ class CmsBlockTitle(models.Model):
 class CmsBlockText(models.Model):
     """Composant texte - réutilisable avec translate=True"""
     _name = 'cms.block.text'
-    _inherit = ['cms.translation.mixin']
+    _inherit = ['cms.block.component']
     _description = 'CMS Block Text Component'
 
     content = fields.Text(string='Text Content', translate=True)
@@ -22,7 +72,7 @@ class CmsBlockText(models.Model):
 class CmsBlockHtml(models.Model):
     """Composant HTML - réutilisable avec translate=True"""
     _name = 'cms.block.html'
-    _inherit = ['cms.translation.mixin']
+    _inherit = ['cms.block.component']
     _description = 'CMS Block HTML Component'
 
     content = fields.Html(string='HTML Content', translate=True)
@@ -31,8 +81,23 @@ class CmsBlockHtml(models.Model):
 class CmsBlockImage(models.Model):
     """Composant image - avec alt text traduit"""
     _name = 'cms.block.image'
-    _inherit = ['cms.translation.mixin']
+    _inherit = ['cms.block.component']
     _description = 'CMS Block Image Component'
 
     url = fields.Char(string='Image URL', required=True)
     alt = fields.Char(string='Alt Text', translate=True)
+
+
+class CmsBlockContent(models.Model):
+    """Contenu compact - tous les champs d'un bloc dans un seul enregistrement, avec translate=True"""
+    _name = 'cms.block.content'
+    _inherit = ['cms.block.component']
+    _description = 'CMS Block Content'
+
+    title = fields.Char(string='Title', translate=True, help='Heading text, or title of a hero')
+    subtitle = fields.Char(string='Subtitle', translate=True)
+    button_text = fields.Char(string='Button Text', translate=True)
+    text = fields.Text(string='Text Content', translate=True)
+    html = fields.Html(string='HTML Content', translate=True)
+    image_url = fields.Char(string='Image URL')
+    image_alt = fields.Char(string='Alt Text', translate=True)
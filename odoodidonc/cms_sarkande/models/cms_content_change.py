@@ -0,0 +1,107 @@
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+
+class CmsContentChange(models.Model):
+    """Journal des changements de contenu, lu par /api/cms/changes pour les resynchronisations incrémentales"""
+    _name = 'cms.content.change'
+    _description = 'CMS Content Change'
+    _order = 'id'
+    _log_access = False
+
+    model = fields.Char(string='Model', required=True, readonly=True)
+    res_id = fields.Integer(string='Record ID', required=True, readonly=True)
+    ref = fields.Char(string='Reference', readonly=True,
+                      help='Slug of the page or key of the translation at the time of the change')
+    date = fields.Datetime(string='Date', required=True, readonly=True, default=fields.Datetime.now)
+
+    def init(self):
+        super().init()
+        # Transaction of the change, which the cursor of /api/cms/changes is made of
+        self.env.cr.execute("""
+            ALTER TABLE cms_content_change
+              ADD COLUMN IF NOT EXISTS xid xid8 NOT NULL DEFAULT pg_current_xact_id()
+        """)
+        self.env.cr.execute("CREATE INDEX IF NOT EXISTS cms_content_change_xid_index ON cms_content_change (xid)")
+
+    @api.model
+    def _log(self, model_name, rows):
+        """Log a change of model_name records, rows being (id, reference)"""
+        rows = [(res_id, ref) for res_id, ref in rows if isinstance(res_id, int)]
+        if not rows:
+            return
+        self.env.cr.execute(SQL("""
+            INSERT INTO cms_content_change (model, res_id, ref, date)
+            SELECT %(model)s, v.res_id, v.ref, now() at time zone 'UTC'
+              FROM (VALUES %(values)s) AS v(res_id, ref)
+        """, model=model_name, values=SQL(', ').join(SQL('(%s::int, %s::varchar)', *row) for row in rows)))
+
+    @api.model
+    def _get_cursor(self):
+        """Current cursor of the log: the oldest transaction still running.
+
+        Every change logged below it is committed (or rolled back), and every
+        change committed later is logged above it, so reading the log up to
+        the cursor and passing it back next time never misses a change.
+        """
+        self.env.cr.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _get_changes(self, since, cursor):
+        """Return what changed between the cursors since and cursor, None if since is too old.
+
+        Changed pages and translation keys are given by slug and key; the
+        removed ones (deleted, archived or renamed) by their former slug and
+        key. Blocks are given by id.
+        """
+        horizon = int(self.env['ir.config_parameter'].sudo().get_param('cms_sarkande.changes_horizon', 0))
+        if since <= 0 or since < horizon:
+            return None
+        self.env.cr.execute("""
+            SELECT DISTINCT model, res_id, ref
+              FROM cms_content_change
+             WHERE xid >= %s::text::xid8 AND xid < %s::text::xid8
+        """, [since, cursor])
+        ids = {'cms.page': set(), 'cms.block': set(), 'cms.translation.key': set()}
+        refs = {'cms.page': set(), 'cms.translation.key': set()}
+        for model_name, res_id, ref in self.env.cr.fetchall():
+            if model_name in ids:
+                ids[model_name].add(res_id)
+            if ref and model_name in refs:
+                refs[model_name].add(ref)
+
+        pages = self.env['cms.page'].browse(ids['cms.page']).exists().filtered('active')
+        blocks = self.env['cms.block'].with_context(active_test=False).browse(ids['cms.block']).exists()
+        blocks = blocks.filtered(lambda block: block.active and block.page_id.active)
+        keys = self.env['cms.translation.key'].browse(ids['cms.translation.key']).exists().filtered('active')
+
+        slugs = set(pages.mapped('slug'))
+        key_names = set(keys.mapped('key'))
+        return {
+            'pages': sorted(slugs),
+            'removed_pages': sorted(refs['cms.page'] - slugs),
+            'blocks': sorted(blocks.ids),
+            'removed_blocks': sorted(ids['cms.block'] - set(blocks.ids)),
+            'translations': sorted(key_names),
+            'removed_translations': sorted(refs['cms.translation.key'] - key_names),
+        }
+
+    @api.autovacuum
+    def _gc_changes(self):
+        """Drop the changes older than cms_sarkande.changes_retention_days (30 by default)"""
+        params = self.env['ir.config_parameter'].sudo()
+        days = int(params.get_param('cms_sarkande.changes_retention_days', 30))
+        self.env.cr.execute("""
+            WITH deleted AS (
+                DELETE FROM cms_content_change
+                      WHERE date < now() at time zone 'UTC' - %s * interval '1 day'
+                  RETURNING xid
+            )
+            SELECT max(xid::text::bigint) FROM deleted
+        """, [days])
+        last_deleted = self.env.cr.fetchone()[0]
+        # Clients whose cursor is not past the dropped changes must reload everything
+        if last_deleted is not None:
+            params.set_param('cms_sarkande.changes_horizon', max(
+                int(params.get_param('cms_sarkande.changes_horizon', 0)), last_deleted + 1))
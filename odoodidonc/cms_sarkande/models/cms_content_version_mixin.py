@@ -0,0 +1,76 @@
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+
+class CmsContentVersionMixin(models.AbstractModel):
+    """Compteur de version du contenu, partagé entre les workers via la base"""
+    _name = 'cms.content.version.mixin'
+    _description = 'CMS Content Version Mixin'
+
+    # Champ identifiant les enregistrements dans le journal des changements
+    _content_change_ref = None
+
+    content_version = fields.Integer(string='Content Version', readonly=True, copy=False, default=0,
+                                     help='Incremented each time the content or one of its parts changes')
+    content_date = fields.Datetime(string='Content Date', readonly=True, copy=False,
+                                   help='Last time the content or one of its parts changed')
+
+    def init(self):
+        super().init()
+        self.env.cr.execute("CREATE SEQUENCE IF NOT EXISTS cms_content_version_seq")
+        # Version of each model's listing, read in O(1) and transactional,
+        # unlike the sequence whose values are visible before commit
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS cms_content_listing_version (
+                model varchar PRIMARY KEY,
+                version bigint NOT NULL
+            )
+        """)
+
+    def _bump_content_version(self):
+        """Give the records a new content version, visible to every worker once committed"""
+        ids = tuple(id_ for id_ in self.ids if isinstance(id_, int))
+        if not ids:
+            return
+        # Plain SQL: no write hooks, no write_date change
+        self.env.cr.execute(SQL(
+            """UPDATE %s
+                  SET content_version = nextval('cms_content_version_seq'),
+                      content_date = now() at time zone 'UTC'
+                WHERE id IN %s""",
+            SQL.identifier(self._table), ids,
+        ))
+        self.invalidate_recordset(['content_version', 'content_date'])
+        self._log_content_change()
+
+    def _log_content_change(self):
+        """Log the records in the content change log (/api/cms/changes), under their current reference"""
+        ref = self._content_change_ref
+        self.env['cms.content.change']._log(self._name, [(record.id, record[ref] if ref else None) for record in self])
+
+    @api.model
+    def _bump_listing_version(self):
+        """Give the model's listing a new version, when records are added, removed or renamed"""
+        self.env.cr.execute("""
+            INSERT INTO cms_content_listing_version (model, version)
+                 VALUES (%s, nextval('cms_content_version_seq'))
+            ON CONFLICT (model) DO UPDATE SET version = EXCLUDED.version
+        """, [self._name])
+
+    @api.model
+    def _get_listing_version(self):
+        """Current version of the model's listing, 0 if it never changed"""
+        self.env.cr.execute("SELECT version FROM cms_content_listing_version WHERE model = %s", [self._name])
+        row = self.env.cr.fetchone()
+        return row[0] if row else 0
+
+    @api.model
+    def _get_content_version(self, domain=None):
+        """Return (max version, count, last change date) of the records matching domain.
+
+        Any create, change or removal among those records changes the result,
+        which makes it usable to build validators for a whole listing.
+        """
+        version, count, date = self._read_group(
+            domain or [], aggregates=['content_version:max', '__count', 'content_date:max'])[0]
+        return version or 0, count, date
@@ -1,10 +1,22 @@
+from collections import defaultdict
+
 from odoo import models, fields, api
+from odoo.tools import SQL, create_index, escape_psql
+
+from odoo.addons.cms_sarkande.tools.page_cache import page_cache
+
+from .cms_block import COMPONENT_FIELDS, COMPONENT_FIELDS_FLAT, copy_rows
+
+# Champs des pages repris dans les listings (navigation, /api/cms/pages)
+LISTING_FIELDS = {'name', 'slug', 'title', 'sequence', 'active', 'show_in_navigation'}
 
 
 class CmsPage(models.Model):
     _name = 'cms.page'
+    _inherit = ['cms.content.version.mixin']
     _description = 'CMS Page'
     _order = 'sequence, id'
+    _content_change_ref = 'slug'
 
     name = fields.Char(string='Page Name', required=True)
     slug = fields.Char(string='URL Slug', required=True, index=True,
@@ -13,6 +25,8 @@ class CmsPage(models.Model):
     meta_description = fields.Text(string='Meta Description')
     active = fields.Boolean(string='Active', default=True)
     sequence = fields.Integer(string='Sequence', default=10)
+    show_in_navigation = fields.Boolean(string='Show in Navigation', default=True,
+                                        help='List this page in the site navigation')
 
     block_ids = fields.One2many('cms.block', 'page_id', string='Blocks')
 
@@ -20,6 +34,168 @@ class CmsPage(models.Model):
         ('slug_unique', 'UNIQUE(slug)', 'The URL slug must be unique!')
     ]
 
+    def init(self):
+        super().init()
+        # Listings: active pages in (sequence, id) order, keyset-paginated (get_pages_list)
+        create_index(self.env.cr, 'cms_page_active_sequence_index', self._table,
+                     ['sequence', 'id'], where='active')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        pages = super().create(vals_list)
+        pages._invalidate_page_cache()
+        self._bump_listing_version()
+        return pages
+
+    def write(self, vals):
+        if 'slug' in vals:
+            # Former slugs, reported as removed by /api/cms/changes
+            self._log_content_change()
+        res = super().write(vals)
+        self._invalidate_page_cache()
+        if LISTING_FIELDS.intersection(vals):
+            self._bump_listing_version()
+        return res
+
+    def unlink(self):
+        page_cache.invalidate(self.env.cr.dbname, self.ids)
+        self._bump_listing_version()
+        self._log_content_change()
+        return super().unlink()
+
+    # Set-based copy instead of the ORM's record by record one (copy_data)
+    def copy(self, default=None):  # pylint: disable=method-required-super
+        """Duplicate the pages with their blocks and content, see _clone()"""
+        return self._clone(default=default)
+
+    def _clone(self, copy_on_write=False, default=None):
+        """Duplicate the pages with their blocks, components and all their languages.
+
+        Set-based: one INSERT for the pages, one per component model and one
+        for the blocks, whatever the number of pages and blocks. With
+        copy_on_write, the components are not copied: the clones share those
+        of the original blocks until one of them is edited
+        (cms.block._detach_shared_components). default gives values of the
+        new pages, as for copy(). Returns the new pages.
+        """
+        if not self:
+            return self
+        self.env.flush_all()
+        cr = self.env.cr
+
+        slugs, names = self._get_clone_slugs(), {page.id: f'{page.name} (copy)' for page in self}
+        page_overrides = {
+            'name': names,
+            'slug': slugs,
+            'content_version': dict.fromkeys(self.ids, 0),
+            'content_date': dict.fromkeys(self.ids),
+        }
+        # Columns are set by the INSERT, the other fields (e.g. block_ids) written afterwards
+        default = dict(default or {})
+        for fname in list(default):
+            field = self._fields[fname]
+            if field.store and field.column_type:
+                page_overrides[fname] = dict.fromkeys(self.ids, field.convert_to_column(default.pop(fname), self))
+        page_map = copy_rows(self, self.ids, page_overrides)
+
+        cr.execute(SQL(
+            "SELECT id, page_id, %s FROM cms_block WHERE page_id IN %s",
+            SQL(', ').join(SQL.identifier(fname) for fname in COMPONENT_FIELDS_FLAT), tuple(self.ids),
+        ))
+        rows = cr.fetchall()
+        components = {
+            (block_id, fname): component_id
+            for block_id, _page_id, *component_ids in rows
+            for fname, component_id in zip(COMPONENT_FIELDS_FLAT, component_ids)
+        }
+        overrides = {'page_id': {block_id: page_map[page_id] for block_id, page_id, *_ in rows}}
+        if copy_on_write:
+            shared = {block_id: any(component_ids) for block_id, _page_id, *component_ids in rows}
+            overrides['shared_components'] = shared
+            # The originals must not change their clones either
+            shared_ids = tuple(block_id for block_id, is_shared in shared.items() if is_shared)
+            if shared_ids:
+                cr.execute("UPDATE cms_block SET shared_components = true WHERE id IN %s", [shared_ids])
+        else:
+            overrides['shared_components'] = dict.fromkeys(overrides['page_id'], False)
+            for model_name, fnames in COMPONENT_FIELDS.items():
+                mapping = copy_rows(self.env[model_name], {components[key] for key in components
+                                                           if key[1] in fnames} - {None})
+                for fname in fnames:
+                    overrides[fname] = {block_id: mapping.get(components[block_id, fname]) for block_id, *_ in rows}
+        block_map = copy_rows(self.env['cms.block'], overrides['page_id'], overrides)
+
+        self.env.invalidate_all()
+        pages = self.browse([page_map[page_id] for page_id in self.ids])
+        pages._bump_content_version()
+        self._bump_listing_version()
+        self.env['cms.block'].browse(list(block_map.values()))._log_content_change()
+        if default:
+            pages.write(default)
+        return pages
+
+    def _get_clone_slugs(self):
+        """Free slugs for copies of the pages: <slug>-copy, <slug>-copy-2..."""
+        self.env.cr.execute(
+            "SELECT slug FROM cms_page WHERE slug LIKE ANY(%s)",
+            [[f"{escape_psql(page.slug)}-copy%" for page in self]],
+        )
+        taken = {slug for slug, in self.env.cr.fetchall()}
+        slugs = {}
+        for page in self:
+            slug = base = f'{page.slug}-copy'
+            index = 1
+            while slug in taken:
+                index += 1
+                slug = f'{base}-{index}'
+            taken.add(slug)
+            slugs[page.id] = slug
+        return slugs
+
+    def action_clone(self):
+        """Clone les pages sélectionnées"""
+        return self._open_clones(self._clone())
+
+    def action_clone_copy_on_write(self):
+        """Clone les pages sélectionnées, composants partagés jusqu'à la première modification"""
+        return self._open_clones(self._clone(copy_on_write=True))
+
+    def _open_clones(self, pages):
+        action = {
+            'name': 'Pages clonées',
+            'type': 'ir.actions.act_window',
+            'res_model': 'cms.page',
+            'target': 'current',
+        }
+        if len(pages) == 1:
+            return dict(action, res_id=pages.id, view_mode='form')
+        return dict(action, domain=[('id', 'in', pages.ids)], view_mode='list,form')
+
+    def _invalidate_page_cache(self):
+        """Bump the content version of the pages and drop their cached JSON"""
+        self._bump_content_version()
+        page_cache.invalidate(self.env.cr.dbname, self.ids)
+
+    @api.model
+    def _get_page_version(self, slug):
+        """Return the id, content version and content date of the active page with this slug.
+
+        has_dynamic_blocks tells whether the page shows live data (user lists)
+        that its content version does not cover. Returns None if there is no
+        such page.
+        """
+        self.flush_model(['slug', 'active', 'content_version', 'content_date'])
+        self.env['cms.block'].flush_model(['page_id', 'block_type', 'active'])
+        self.env.cr.execute("""
+            SELECT p.id, p.content_version, p.content_date,
+                   EXISTS(SELECT 1 FROM cms_block b
+                           WHERE b.page_id = p.id AND b.active AND b.block_type = 'user_list') AS has_dynamic_blocks
+              FROM cms_page p
+             WHERE p.slug = %s AND p.active
+             LIMIT 1
+        """, [slug])
+        return self.env.cr.dictfetchone()
+
     def action_open_translate_wizard(self):
         """Open translation wizard for this page"""
         self.ensure_one()
@@ -35,11 +211,110 @@ class CmsPage(models.Model):
     def get_page_data(self, lang='en_US'):
         """Return page data formatted for API consumption with translations"""
         self.ensure_one()
+        return self.get_pages_data(lang=lang)[0]
+
+    def get_pages_data(self, lang='en_US'):
+        """Return the API data of several pages, loading all their blocks at once"""
+        blocks = self.env['cms.block'].search([('page_id', 'in', self.ids)], order='sequence, id')
+        blocks_data = blocks._get_blocks_data(lang=lang)
+
+        blocks_by_page = {page.id: [] for page in self}
+        for block in blocks:
+            blocks_by_page[block.page_id.id].append(blocks_data[block.id])
+
+        return [{
+            'id': page.id,
+            'name': page.name,
+            'slug': page.slug,
+            'title': page.title or page.name,
+            'meta_description': page.meta_description or '',
+            'blocks': blocks_by_page[page.id],
+        } for page in self]
+
+    @api.model
+    def get_pages_list(self, navigation=False, after=None, limit=None):
+        """Return the active pages for listings, in one projection query.
+
+        Keyset pagination on (sequence, id): after is the (sequence, id) of the
+        last page already read. navigation restricts the listing to the pages
+        shown in the navigation. Returns (pages, cursor of the next page or
+        None when this one is the last).
+        """
+        self.flush_model(LISTING_FIELDS)
+        conditions = [SQL("active")]
+        if navigation:
+            conditions.append(SQL("show_in_navigation"))
+        if after:
+            conditions.append(SQL("(sequence, id) > (%s, %s)", *after))
+        self.env.cr.execute(SQL(
+            """SELECT id, name, slug, COALESCE(NULLIF(title, ''), name), sequence
+                 FROM cms_page
+                WHERE %s
+             ORDER BY sequence, id
+                %s""",
+            SQL(" AND ").join(conditions),
+            SQL("LIMIT %s", limit + 1) if limit else SQL(),
+        ))
+        rows = self.env.cr.fetchall()
+        next_after = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_after = (rows[-1][4], rows[-1][0])
+        pages = [{
+            'id': page_id,
+            'name': name,
+            'slug': slug,
+            'title': title,
+        } for page_id, name, slug, title, _sequence in rows]
+        return pages, next_after
+
+    def action_auto_translate(self):
+        """Lance la traduction automatique des pages dans toutes les langues actives.
+
+        The translation runs in the background; the returned action shows the
+        job and its progress.
+        """
+        languages = self.env['res.lang'].search([
+            ('active', '=', True),
+            ('code', '!=', 'en_US'),
+        ])
+        job = self.env['cms.translation.job'].create({
+            'page_ids': [(6, 0, self.ids)],
+            'line_ids': [(0, 0, {'lang_id': lang.id}) for lang in languages],
+        })
+        self.env.ref('cms_sarkande.ir_cron_cms_translation_job')._trigger()
         return {
-            'id': self.id,
-            'name': self.name,
-            'slug': self.slug,
-            'title': self.title or self.name,
-            'meta_description': self.meta_description or '',
-            'blocks': [block.get_block_data(lang=lang) for block in self.block_ids.sorted('sequence')]
+            'name': 'Traduction automatique',
+            'type': 'ir.actions.act_window',
+            'res_model': 'cms.translation.job',
+            'res_id': job.id,
+            'view_mode': 'form',
+            'target': 'current',
         }
+
+    def _get_translation_sources(self):
+        """Return {source text: {(component model, field): component ids}} for the pages' blocks"""
+        blocks = self.env['cms.block'].with_context(lang='en_US').search([('page_id', 'in', self.ids)])
+        # The translations are written to the components: copy-on-write clones get their own first
+        blocks._detach_shared_components()
+        blocks._fetch_components()
+
+        sources = defaultdict(lambda: defaultdict(list))
+        for block in blocks:
+            for field_info in block._get_translatable_fields():
+                component = field_info['component']
+                text = component[field_info['field']]
+                if text:
+                    sources[text][(component._name, field_info['field'])].append(component.id)
+        return sources
+
+    def _write_translations(self, sources, translations, lang_code):
+        """Write the translation of every source text on all the records using it"""
+        values = defaultdict(list)
+        for text, targets in sources.items():
+            for (model_name, field_name), component_ids in targets.items():
+                values[model_name].extend(
+                    (component_id, field_name, lang_code, translations[text]) for component_id in component_ids)
+
+        for model_name, model_values in values.items():
+            self.env[model_name].update_field_translations_multi(model_values)
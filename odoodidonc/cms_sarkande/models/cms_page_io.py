@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+from collections import defaultdict
+
+from odoo import models, api
+from odoo.tools import SQL
+
+from .cms_block import BLOCK_TYPE_CONTENT_FIELDS, CONTENT_FIELDS
+
+_logger = logging.getLogger(__name__)
+
+# Champs exportés tels quels, pour les pages et les blocs
+PAGE_IO_FIELDS = ['name', 'slug', 'title', 'meta_description', 'sequence', 'active', 'show_in_navigation']
+BLOCK_IO_FIELDS = [
+    'name', 'block_type', 'sequence', 'active', 'heading_level', 'limit', 'user_domain', 'user_order',
+    'hero_button_url', 'hero_background_image',
+]
+
+EXPORT_BATCH_SIZE = 200
+IMPORT_CHUNK_SIZE = 100
+
+
+class CmsPageIo(models.AbstractModel):
+    """Import / export NDJSON des pages : une page par ligne, avec ses blocs et leurs traductions.
+
+    Each line is a page: its PAGE_IO_FIELDS and "blocks", a list of blocks
+    with their BLOCK_IO_FIELDS and "content", the content fields of the
+    block type (hero_title, image_url...). Translated content is given as
+    {lang: value}, with only the languages actually stored.
+
+    From an Odoo shell::
+
+        env['cms.page.io']._export_ndjson(open('/tmp/pages.ndjson', 'w'))
+        env['cms.page.io']._import_ndjson('/tmp/pages.ndjson')
+
+    or with ``odoo-bin cms_pages export|import <path> -d <db>``.
+    """
+    _name = 'cms.page.io'
+    _description = 'CMS Page Import/Export'
+
+    @api.model
+    def _export_ndjson(self, stream, domain=None, batch_size=EXPORT_BATCH_SIZE):
+        """Write the pages matching domain (archived included) to a text stream, one per line.
+
+        Pages are read by batches of batch_size and the cache is cleared after
+        each one, so the memory used does not depend on the number of pages.
+        Returns the number of pages written.
+        """
+        pages = self.env['cms.page'].with_context(active_test=False)
+        count, last_id = 0, 0
+        while True:
+            batch = pages.search((domain or []) + [('id', '>', last_id)], order='id', limit=batch_size)
+            if not batch:
+                return count
+            for page_data in self._export_pages(batch):
+                stream.write(json.dumps(page_data, ensure_ascii=False) + '\n')
+            count += len(batch)
+            last_id = batch[-1].id
+            self.env.invalidate_all()
+
+    def _export_pages(self, pages):
+        """Export data of the pages, one query per component model for all their content"""
+        pages.fetch(PAGE_IO_FIELDS)
+        blocks = self.env['cms.block'].with_context(active_test=False).search(
+            [('page_id', 'in', pages.ids)], order='page_id, sequence, id')
+        blocks.fetch(BLOCK_IO_FIELDS + ['page_id'])
+        blocks._fetch_components()
+
+        # Content of the blocks: (component model, id, field) of each block field
+        targets = {}
+        ids_by_model, fields_by_model = defaultdict(set), defaultdict(set)
+        for block in blocks:
+            for fname in BLOCK_TYPE_CONTENT_FIELDS.get(block.block_type, []):
+                component, component_field = block._get_content_component(fname)
+                if component:
+                    targets[block.id, fname] = (component._name, component.id, component_field)
+                    ids_by_model[component._name].add(component.id)
+                    fields_by_model[component._name].add(component_field)
+        values = {
+            model_name: self._read_stored_values(model_name, ids, fields_by_model[model_name])
+            for model_name, ids in ids_by_model.items()
+        }
+
+        blocks_by_page = defaultdict(list)
+        for block in blocks:
+            block_data = {fname: block[fname] for fname in BLOCK_IO_FIELDS}
+            block_data['content'] = content = {}
+            for fname in BLOCK_TYPE_CONTENT_FIELDS.get(block.block_type, []):
+                if (block.id, fname) in targets:
+                    model_name, component_id, component_field = targets[block.id, fname]
+                    content[fname] = values[model_name][component_id][component_field]
+            blocks_by_page[block.page_id.id].append(block_data)
+
+        for page in pages:
+            page_data = {fname: page[fname] for fname in PAGE_IO_FIELDS}
+            page_data['blocks'] = blocks_by_page[page.id]
+            yield page_data
+
+    def _read_stored_values(self, model_name, ids, field_names):
+        """Stored values of fields, translated ones as {lang: value} without fallback"""
+        model = self.env[model_name]
+        field_names = sorted(field_names)
+        model.flush_model(field_names)
+        self.env.cr.execute(SQL(
+            "SELECT id, %s FROM %s WHERE id IN %s",
+            SQL(', ').join(SQL.identifier(fname) for fname in field_names),
+            SQL.identifier(model._table),
+            tuple(ids),
+        ))
+        return {
+            res_id: dict(zip(field_names, row_values))
+            for res_id, *row_values in self.env.cr.fetchall()
+        }
+
+    @api.model
+    def _import_ndjson(self, path, chunk_size=IMPORT_CHUNK_SIZE, restart=False):
+        """Import the pages of an NDJSON file, replacing the existing pages with the same slug.
+
+        The file is read line by line and committed every chunk_size pages.
+        After each commit the number of lines done is saved to
+        <path>.checkpoint: a new run starts after it unless restart is set.
+        The checkpoint is removed once the whole file is imported. Returns the
+        number of pages imported by this run.
+        """
+        checkpoint_path = f'{path}.checkpoint'
+        done = 0
+        if not restart and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                done = json.load(f)['lines']
+            _logger.info("Resuming the import of %s after line %s", path, done)
+
+        count, chunk = 0, []
+        with open(path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if line_number <= done or not line.strip():
+                    continue
+                chunk.append(json.loads(line))
+                if len(chunk) >= chunk_size:
+                    count += self._import_chunk(chunk, checkpoint_path, line_number)
+                    chunk = []
+            if chunk:
+                count += self._import_chunk(chunk, checkpoint_path, line_number)
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        return count
+
+    def _import_chunk(self, pages_data, checkpoint_path, line_number):
+        """Import and commit one chunk of pages, then save the checkpoint"""
+        self._import_pages(pages_data)
+        # Intentional: each chunk is committed so an interrupted import resumes from its checkpoint
+        self.env.cr.commit()  # pylint: disable=invalid-commit
+        with open(checkpoint_path, 'w') as f:
+            json.dump({'lines': line_number}, f)
+        self.env.invalidate_all()
+        _logger.info("Imported %s pages, up to line %s", len(pages_data), line_number)
+        return len(pages_data)
+
+    def _import_pages(self, pages_data):
+        """Create or replace pages with their blocks, components and translations, by batches"""
+        # The last line wins when a slug appears twice
+        data_by_slug = {page_data['slug']: page_data for page_data in pages_data}
+        pages_data = list(data_by_slug.values())
+        Page = self.env['cms.page'].with_context(active_test=False)
+        Block = self.env['cms.block'].with_context(active_test=False)
+
+        pages = Page.search([('slug', 'in', list(data_by_slug))])
+        Block.search([('page_id', 'in', pages.ids)])._unlink_with_components()
+        page_by_slug = {page.slug: page for page in pages}
+        for page in pages:
+            page_data = data_by_slug[page.slug]
+            page.write({fname: page_data[fname] for fname in PAGE_IO_FIELDS if fname in page_data})
+        new_pages = Page.create([
+            {fname: page_data[fname] for fname in PAGE_IO_FIELDS if fname in page_data}
+            for page_data in pages_data if page_data['slug'] not in page_by_slug
+        ])
+        page_by_slug.update((page.slug, page) for page in new_pages)
+
+        blocks_data = [
+            (page_by_slug[page_data['slug']], block_data)
+            for page_data in pages_data for block_data in page_data.get('blocks', [])
+        ]
+        vals_list = []
+        for page, block_data in blocks_data:
+            vals = {fname: block_data[fname] for fname in BLOCK_IO_FIELDS if fname in block_data}
+            vals['page_id'] = page.id
+            # en_US content, given to the components created with the blocks
+            for fname, value in block_data.get('content', {}).items():
+                value = value.get('en_US') if isinstance(value, dict) else value
+                if fname in CONTENT_FIELDS and value:
+                    vals[fname] = value
+            vals_list.append(vals)
+        blocks = Block.create(vals_list)
+
+        # Other languages, one bulk update per component model
+        translations = defaultdict(list)
+        for block, (_page, block_data) in zip(blocks, blocks_data):
+            for fname, value in block_data.get('content', {}).items():
+                if not isinstance(value, dict) or fname not in CONTENT_FIELDS:
+                    continue
+                component, component_field = block._get_content_component(fname)
+                if not component:
+                    continue
+                translations[component._name].extend(
+                    (component.id, component_field, lang, text)
+                    for lang, text in value.items() if lang != 'en_US' and text)
+        for model_name, values in translations.items():
+            self.env[model_name].update_field_translations_multi(values)
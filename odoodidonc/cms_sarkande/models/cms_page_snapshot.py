@@ -0,0 +1,130 @@
+from collections import defaultdict
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+from odoo.addons.cms_sarkande.tools.static_engine import get_static_engine
+
+
+class CmsPageSnapshot(models.Model):
+    """HTML pré-rendu d'une page CMS dans une langue, servi tel quel par la route du slug"""
+    _name = 'cms.page.snapshot'
+    _description = 'CMS Page Snapshot'
+    _order = 'page_id, lang'
+
+    page_id = fields.Many2one('cms.page', string='Page', required=True, readonly=True,
+                              ondelete='cascade', index=True)
+    lang = fields.Char(string='Language', required=True, readonly=True)
+    content_version = fields.Integer(string='Content Version', readonly=True,
+                                     help='Content version of the page the HTML was rendered from')
+    shell_version = fields.Char(string='Shell Version', readonly=True,
+                                help='Build of the front the HTML was rendered into')
+    html = fields.Text(string='HTML', readonly=True)
+
+    _sql_constraints = [
+        ('page_lang_unique', 'UNIQUE(page_id, lang)', 'A page can only have one snapshot per language!')
+    ]
+
+    @api.model
+    def _get_snapshot(self, slug, lang):
+        """Return the pre-rendered page with this slug, rendering it again if it is stale.
+
+        The result holds the page id, content version and date, the shell
+        version, the HTML and whether it may be cached: pages showing live
+        data (user lists) are rendered on every call and never stored.
+        Returns None when there is no such page or the front has no page shell.
+        """
+        renderer = get_static_engine().get_page_renderer()
+        if renderer is None:
+            return None
+        page_version = self.env['cms.page']._get_page_version(slug)
+        if not page_version:
+            return None
+
+        snapshot = dict(page_version, cacheable=not page_version['has_dynamic_blocks'],
+                        shell_version=renderer.version, html=None)
+        if snapshot['cacheable']:
+            self.flush_model()
+            self.env.cr.execute("""
+                SELECT html
+                  FROM cms_page_snapshot
+                 WHERE page_id = %s AND lang = %s AND content_version = %s AND shell_version = %s
+            """, [page_version['id'], lang, page_version['content_version'], renderer.version])
+            row = self.env.cr.fetchone()
+            snapshot['html'] = row and row[0]
+
+        if snapshot['html'] is None:
+            page = self.env['cms.page'].browse(page_version['id'])
+            translations = self.env['cms.translation.key'].get_translations(lang) if not snapshot['cacheable'] else {}
+            snapshot['html'] = renderer.render(page.get_page_data(lang=lang), lang, translations)
+            if snapshot['html'] is not None and snapshot['cacheable']:
+                self._store([(page.id, lang, page_version['content_version'], snapshot['html'])], renderer.version)
+        return snapshot if snapshot['html'] is not None else None
+
+    @api.model
+    def _store(self, rows, shell_version):
+        """Insert or replace snapshots, rows being (page id, lang, content version, html)"""
+        if not rows:
+            return
+        self.flush_model()
+        self.env.cr.execute(SQL("""
+            INSERT INTO cms_page_snapshot
+                   (page_id, lang, content_version, shell_version, html,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT v.page_id, v.lang, v.content_version, %(shell_version)s, v.html,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM (VALUES %(values)s) AS v(page_id, lang, content_version, html)
+       ON CONFLICT (page_id, lang) DO UPDATE
+               SET content_version = EXCLUDED.content_version,
+                   shell_version = EXCLUDED.shell_version,
+                   html = EXCLUDED.html,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+        """, shell_version=shell_version, uid=self.env.uid, values=SQL(', ').join(SQL('(%s::int, %s, %s::int, %s)', *row) for row in rows)))
+        self.invalidate_model()
+
+    @api.model
+    def _cron_refresh_snapshots(self, limit=500):
+        """Render again the snapshots of the pages changed since their last rendering.
+
+        Only stale (page, language) pairs are rendered, at most limit per run;
+        the cron triggers itself again while some remain.
+        """
+        renderer = get_static_engine().get_page_renderer()
+        if renderer is None:
+            return
+        self.env['cms.page'].flush_model(['active', 'content_version'])
+        self.env['cms.block'].flush_model(['page_id', 'block_type', 'active'])
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT p.id, l.code
+              FROM cms_page p
+              JOIN res_lang l ON l.active
+         LEFT JOIN cms_page_snapshot s ON s.page_id = p.id AND s.lang = l.code
+             WHERE p.active
+               AND NOT EXISTS(SELECT 1 FROM cms_block b
+                               WHERE b.page_id = p.id AND b.active AND b.block_type = 'user_list')
+               AND (s.id IS NULL OR s.content_version != p.content_version OR s.shell_version != %s)
+          ORDER BY p.sequence, p.id
+             LIMIT %s
+        """, [renderer.version, limit + 1])
+        stale = self.env.cr.fetchall()
+
+        page_ids_by_lang = defaultdict(list)
+        for page_id, lang in stale[:limit]:
+            page_ids_by_lang[lang].append(page_id)
+
+        for lang, page_ids in page_ids_by_lang.items():
+            pages = self.env['cms.page'].browse(page_ids)
+            versions = dict(zip(pages.ids, pages.mapped('content_version')))
+            rows = []
+            for page_data in pages.get_pages_data(lang=lang):
+                html = renderer.render(page_data, lang, {})
+                if html is not None:
+                    rows.append((page_data['id'], lang, versions[page_data['id']], html))
+            self._store(rows, renderer.version)
+            # Intentional: keep the snapshots rendered so far if the cron is interrupted (e.g. by its time limit)
+            self.env.cr.commit()  # pylint: disable=invalid-commit
+
+        if len(stale) > limit:
+            self.env.ref('cms_sarkande.ir_cron_cms_page_snapshot')._trigger()
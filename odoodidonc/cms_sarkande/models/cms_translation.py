@@ -1,10 +1,12 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 
 
 class CmsTranslationKey(models.Model):
     _name = 'cms.translation.key'
+    _inherit = ['cms.content.version.mixin']
     _description = 'CMS Translation Key'
     _order = 'key'
+    _content_change_ref = 'key'
 
     key = fields.Char(string='Translation Key', required=True, index=True,
                      help='Unique key for this translation (e.g., "nav.home", "block.team_members")')
@@ -16,26 +18,72 @@ class CmsTranslationKey(models.Model):
         ('key_unique', 'UNIQUE(key)', 'This translation key already exists!')
     ]
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        keys = super().create(vals_list)
+        keys._bump_content_version()
+        return keys
+
+    def write(self, vals):
+        if 'key' in vals:
+            self._log_content_change()
+        res = super().write(vals)
+        self._bump_content_version()
+        return res
+
+    def unlink(self):
+        self._log_content_change()
+        self._bump_listing_version()
+        return super().unlink()
+
+    def _bump_content_version(self):
+        # Every change of keys or lines goes through here: bump the translations version too
+        super()._bump_content_version()
+        if self:
+            self._bump_listing_version()
+
+    @api.model
+    def _get_translations_version(self):
+        """Version of all the translations, changed by the commit of any change on keys or lines.
+
+        Transactional, unlike the content versions of the keys: a transaction
+        committing after a later one still changes it.
+        """
+        return self._get_listing_version()
+
     @api.model
     def get_translations(self, lang='en_US'):
         """Return all translations for a given language as a dictionary"""
-        keys = self.search([('active', '=', True)])
-        translations = {}
-
-        for key in keys:
-            # Chercher la ligne de traduction pour cette langue
-            line = key.line_ids.filtered(lambda l: l.lang == lang and l.active)
-            if line:
-                translations[key.key] = line[0].value
-            else:
-                # Fallback sur l'anglais si la traduction n'existe pas
-                fallback_line = key.line_ids.filtered(lambda l: l.lang == 'en_US' and l.active)
-                if fallback_line:
-                    translations[key.key] = fallback_line[0].value
-                else:
-                    translations[key.key] = key.key  # Dernier recours : la clé elle-même
-
-        return translations
+        return dict(self._get_translations_cached(lang, self._get_translations_version()))
+
+    @api.model
+    @tools.ormcache('lang', 'version')
+    def _get_translations_cached(self, lang, version):
+        """Résout toutes les clés en une requête : langue cible, puis en_US, puis la clé elle-même.
+
+        Cached per registry, language and translations version
+        (_get_translations_version): no cache has to be cleared.
+        """
+        self.flush_model(['key', 'active'])
+        self.env['cms.translation.line'].flush_model(['translation_key_id', 'lang', 'value', 'active'])
+        self.env.cr.execute("""
+            SELECT k.key, COALESCE(target.value, fallback.value, k.key)
+              FROM cms_translation_key k
+         LEFT JOIN cms_translation_line target
+                ON target.translation_key_id = k.id AND target.lang = %s AND target.active
+         LEFT JOIN cms_translation_line fallback
+                ON fallback.translation_key_id = k.id AND fallback.lang = 'en_US' AND fallback.active
+             WHERE k.active
+          ORDER BY k.key
+        """, [lang])
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _get_languages_version(self):
+        """Return (count, last write date) of the active languages"""
+        count, date = self.env['res.lang']._read_group(
+            [('active', '=', True)], aggregates=['__count', 'write_date:max'])[0]
+        return count, date
 
     @api.model
     def get_available_languages(self):
@@ -62,3 +110,25 @@ class CmsTranslationLine(models.Model):
     _sql_constraints = [
         ('key_lang_unique', 'UNIQUE(translation_key_id, lang_id)', 'A translation for this language already exists for this key!')
     ]
+
+    def init(self):
+        super().init()
+        # Active lines of one language, joined to the keys (_get_translations_cached)
+        tools.create_index(self.env.cr, 'cms_translation_line_lang_key_index', self._table,
+                           ['lang', 'translation_key_id'], where='active')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines.translation_key_id._bump_content_version()
+        return lines
+
+    def write(self, vals):
+        keys = self.translation_key_id
+        res = super().write(vals)
+        (keys | self.translation_key_id)._bump_content_version()
+        return res
+
+    def unlink(self):
+        self.translation_key_id._bump_content_version()
+        return super().unlink()
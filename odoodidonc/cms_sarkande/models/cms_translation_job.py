@@ -0,0 +1,225 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from odoo import models, fields, api
+from odoo.exceptions import AccessError
+
+from odoo.addons.iap.tools.iap_tools import InsufficientCreditError
+
+_logger = logging.getLogger(__name__)
+
+# Errors worth retrying: network issues (iap_jsonrpc reports them as AccessError)
+TRANSIENT_ERRORS = (requests.exceptions.RequestException, AccessError)
+
+
+class RateLimiter:
+    """Limite le nombre de requêtes par seconde, partagé entre les threads"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_call = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_call - now
+            self._next_call = max(now, self._next_call) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CmsTranslationJob(models.Model):
+    _name = 'cms.translation.job'
+    _description = 'CMS Translation Job'
+    _order = 'id desc'
+
+    name = fields.Char(string='Name', compute='_compute_name')
+    page_ids = fields.Many2many('cms.page', string='Pages', required=True)
+    line_ids = fields.One2many('cms.translation.job.line', 'job_id', string='Languages')
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='pending', required=True, readonly=True)
+    progress = fields.Float(string='Progress', compute='_compute_progress')
+    date_start = fields.Datetime(string='Started On', readonly=True)
+    date_end = fields.Datetime(string='Finished On', readonly=True)
+
+    @api.depends('page_ids')
+    def _compute_name(self):
+        for job in self:
+            job.name = ', '.join(job.page_ids.mapped('name'))
+
+    @api.depends('line_ids.text_count', 'line_ids.translated_count')
+    def _compute_progress(self):
+        for job in self:
+            total = sum(job.line_ids.mapped('text_count'))
+            done = sum(job.line_ids.mapped('translated_count'))
+            job.progress = 100.0 * done / total if total else 0.0
+
+    def action_retry(self):
+        """Relance les langues en échec"""
+        self.line_ids.filtered(lambda line: line.state == 'failed').write({'state': 'pending', 'error': False})
+        self.write({'state': 'pending'})
+        self.env.ref('cms_sarkande.ir_cron_cms_translation_job')._trigger()
+
+    @api.model
+    def _cron_process_jobs(self):
+        """Run the pending translation jobs, committing their progress as they go"""
+        for job in self.search([('state', '=', 'pending')], order='id'):
+            job.write({'state': 'running', 'date_start': fields.Datetime.now(), 'date_end': False})
+            # The job shows as running while it works
+            self.env.cr.commit()  # pylint: disable=invalid-commit
+            try:
+                job._run()
+            except Exception:
+                # Otherwise the job stays running forever
+                _logger.exception("Translation job %s failed", job.id)
+                self.env.cr.rollback()
+                job.write({'state': 'failed', 'date_end': fields.Datetime.now()})
+            # One transaction per job
+            self.env.cr.commit()  # pylint: disable=invalid-commit
+
+    def _run(self):
+        """Translate the pages into every pending language, languages running concurrently"""
+        self.ensure_one()
+        sources = self.page_ids._get_translation_sources()
+        texts = list(sources)
+        # Plain data only: the workers use their own cursor
+        sources = {text: dict(targets) for text, targets in sources.items()}
+
+        lines = self.line_ids.filtered(lambda line: line.state != 'done')
+        lines.write({
+            'state': 'pending',
+            'text_count': len(texts),
+            'translated_count': 0,
+            'memory_hits': 0,
+            'memory_misses': 0,
+        })
+        # The workers read the lines from their own cursor
+        self.env.cr.commit()  # pylint: disable=invalid-commit
+
+        icp = self.env['ir.config_parameter'].sudo()
+        workers = int(icp.get_param('cms_sarkande.translation_workers', 4))
+        limiter = RateLimiter(float(icp.get_param('cms_sarkande.translation_rate_limit', 5)))
+        write_lock = threading.Lock()
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix='cms_translation') as executor:
+            futures = [
+                executor.submit(self._run_line, line.id, line.lang_id.code, texts, sources, limiter, write_lock)
+                for line in lines
+            ]
+            errors = [future.result() for future in futures]
+
+        # Log all failures at once
+        self.env['ir.logging'].sudo().create([{
+            'name': 'cms_translation',
+            'type': 'server',
+            'level': 'warning',
+            'message': error,
+            'path': f'{self._name}._run',
+            'func': '_run',
+            'line': '0',
+        } for error in errors if error])
+
+        # From the workers' results: the snapshot of this cursor may predate their commits
+        self.line_ids.invalidate_recordset()
+        self.write({'state': 'failed' if any(errors) else 'done', 'date_end': fields.Datetime.now()})
+
+    def _run_line(self, line_id, lang_code, texts, sources, limiter, write_lock):
+        """Translate one language in a worker thread, with its own cursor.
+
+        Returns an error message, or None on success.
+        """
+        with self.env.registry.cursor() as cr:
+            env = self.env(cr=cr)
+            line = env['cms.translation.job.line'].browse(line_id)
+            line.write({'state': 'running', 'attempts': 0})
+            # Worker cursor, progress is visible as it goes
+            cr.commit()  # pylint: disable=invalid-commit
+
+            translator = env['cms.translation.mixin']
+            try:
+                service = self._with_retry(translator._get_translation_service(), limiter, line)
+
+                def on_batch(count):
+                    line.translated_count = count
+                    # Worker cursor, progress is visible as it goes
+                    cr.commit()  # pylint: disable=invalid-commit
+
+                stats = {}
+                translations = translator._iap_translate_texts(
+                    texts, lang_code, service=service, on_batch=on_batch, stats=stats)
+                # Translations of one component row must not be written concurrently
+                with write_lock:
+                    line.job_id.page_ids._write_translations(sources, dict(zip(texts, translations)), lang_code)
+                    line.write({
+                        'state': 'done',
+                        'error': False,
+                        'translated_count': len(texts),
+                        'memory_hits': stats['hits'],
+                        'memory_misses': stats['misses'],
+                    })
+                    # Worker cursor, committed under the write lock
+                    cr.commit()  # pylint: disable=invalid-commit
+                return None
+            except Exception as e:
+                _logger.warning("Translation to %s failed", lang_code, exc_info=True)
+                cr.rollback()
+                message = f'Failed to translate to {lang_code}: {e}'
+                line.write({'state': 'failed', 'error': message})
+                cr.commit()  # pylint: disable=invalid-commit
+                return message
+
+    def _with_retry(self, service, limiter, line):
+        """Wrap a translation service with rate limiting and exponential backoff"""
+        icp = line.env['ir.config_parameter'].sudo()
+        max_attempts = int(icp.get_param('cms_sarkande.translation_max_attempts', 4))
+        base_delay = float(icp.get_param('cms_sarkande.translation_retry_delay', 1.0))
+
+        def call(params):
+            for attempt in range(1, max_attempts + 1):
+                if attempt > 1:
+                    time.sleep(base_delay * 2 ** (attempt - 2) * random.uniform(1.0, 1.5))
+                    # Committed before the call: the line's transaction is rolled back if it fails
+                    line.attempts += 1
+                    line.env.cr.commit()  # pylint: disable=invalid-commit
+                limiter.wait()
+                try:
+                    return service(params)
+                except InsufficientCreditError:
+                    raise
+                except TRANSIENT_ERRORS:
+                    if attempt == max_attempts:
+                        raise
+        return call
+
+
+class CmsTranslationJobLine(models.Model):
+    _name = 'cms.translation.job.line'
+    _description = 'CMS Translation Job Language'
+    _order = 'job_id, id'
+
+    job_id = fields.Many2one('cms.translation.job', string='Job', required=True, ondelete='cascade')
+    lang_id = fields.Many2one('res.lang', string='Language', required=True)
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='pending', required=True, readonly=True)
+    text_count = fields.Integer(string='Texts', readonly=True)
+    translated_count = fields.Integer(string='Translated', readonly=True)
+    attempts = fields.Integer(string='Retries', readonly=True)
+    memory_hits = fields.Integer(string='Memory Hits', readonly=True,
+                                 help='Texts found in the translation memory')
+    memory_misses = fields.Integer(string='Memory Misses', readonly=True,
+                                   help='Texts sent to the translation service')
+    error = fields.Text(string='Error', readonly=True)
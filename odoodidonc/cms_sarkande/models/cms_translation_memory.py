@@ -0,0 +1,90 @@
+import hashlib
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+
+def normalize_source(text):
+    """Normalise un texte source : espaces superflus supprimés"""
+    return ' '.join(str(text).split())
+
+
+def source_hash(text):
+    return hashlib.sha256(normalize_source(text).encode()).hexdigest()
+
+
+class CmsTranslationMemory(models.Model):
+    """Mémoire de traduction : évite de retraduire un texte déjà vu"""
+    _name = 'cms.translation.memory'
+    _description = 'CMS Translation Memory'
+    _order = 'hit_count desc, id desc'
+    _rec_name = 'source_text'
+
+    source_hash = fields.Char(string='Source Hash', required=True, readonly=True,
+                              help='SHA-256 of the normalized source text')
+    source_lang = fields.Char(string='Source Language', required=True, readonly=True)
+    target_lang = fields.Char(string='Target Language', required=True, readonly=True)
+    source_text = fields.Text(string='Source', required=True)
+    target_text = fields.Text(string='Translation', required=True)
+    origin = fields.Selection([
+        ('machine', 'Machine Translation'),
+        ('human', 'Human Translation'),
+    ], string='Origin', required=True, default='machine')
+    hit_count = fields.Integer(string='Hits', readonly=True, default=0)
+
+    _sql_constraints = [
+        ('source_unique', 'UNIQUE(source_hash, source_lang, target_lang)',
+         'This source text already has a translation for this language!')
+    ]
+
+    @api.model
+    def _lookup(self, texts, source_lang, target_lang):
+        """Return {text: translation} for the texts already in memory, counting the hits"""
+        hashes = {}
+        for text in texts:
+            hashes.setdefault(source_hash(text), []).append(text)
+        if not hashes:
+            return {}
+        self.flush_model()
+        self.env.cr.execute("""
+            UPDATE cms_translation_memory
+               SET hit_count = hit_count + 1
+             WHERE source_hash IN %s AND source_lang = %s AND target_lang = %s
+         RETURNING source_hash, target_text
+        """, [tuple(hashes), source_lang, target_lang])
+        self.invalidate_model(['hit_count'])
+        return {
+            text: target
+            for hash_, target in self.env.cr.fetchall()
+            for text in hashes[hash_]
+        }
+
+    @api.model
+    def _store(self, translations, source_lang, target_lang, origin='machine'):
+        """Insert or update translations ({source text: translation}) in one statement.
+
+        Human translations replace machine ones, never the other way round.
+        """
+        rows = {
+            source_hash(source): (source_hash(source), source_lang, target_lang, str(source), str(target), origin)
+            for source, target in translations.items()
+            if source and target
+        }
+        if not rows:
+            return
+        self.flush_model()
+        self.env.cr.execute(SQL("""
+            INSERT INTO cms_translation_memory
+                   (source_hash, source_lang, target_lang, source_text, target_text, origin, hit_count,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT v.source_hash, v.source_lang, v.target_lang, v.source_text, v.target_text, v.origin, 0,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM (VALUES %(values)s) AS v(source_hash, source_lang, target_lang, source_text, target_text, origin)
+       ON CONFLICT (source_hash, source_lang, target_lang) DO UPDATE
+               SET target_text = EXCLUDED.target_text,
+                   origin = EXCLUDED.origin,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+             WHERE cms_translation_memory.origin = 'machine' OR EXCLUDED.origin = 'human'
+        """, uid=self.env.uid, values=SQL(', ').join(SQL('(%s, %s, %s, %s, %s, %s)', *row) for row in rows.values())))
+        self.invalidate_model()
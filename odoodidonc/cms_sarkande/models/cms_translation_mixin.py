@@ -1,5 +1,11 @@
+import json
+from collections import defaultdict
+
 from odoo import models, api
 from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+from odoo.addons.iap.tools import iap_tools
 
 
 class CmsTranslationMixin(models.AbstractModel):
@@ -13,28 +19,41 @@ class CmsTranslationMixin(models.AbstractModel):
         record = self.browse(res_id)
         if not record.exists():
             return {}
+        return self.get_field_translations_multi([res_id], [field_name])[res_id][field_name]
+
+    @api.model
+    def get_field_translations_multi(self, res_ids, field_names, langs=None):
+        """Read the values of several fields of several records in all languages at once.
 
-        # Get all active languages
-        languages = self.env['res.lang'].search([('active', '=', True)])
-        translations = {}
+        Returns {res_id: {field_name: {lang: value}}}. Like the ORM, a missing
+        translation falls back to the en_US value. langs defaults to the
+        active languages.
+        """
+        if langs is None:
+            langs = [code for code, _name in self.env['res.lang'].get_installed()]
+        res_ids = tuple(res_ids)
+        if not res_ids:
+            return {}
 
-        for lang in languages:
-            # Get translation from ir.translation table
-            translation = self.env['ir.translation'].search([
-                ('type', '=', 'model'),
-                ('name', '=', f'{self._name},{field_name}'),
-                ('res_id', '=', res_id),
-                ('lang', '=', lang.code),
-            ], limit=1)
-
-            if translation:
-                translations[lang.code] = translation.value
-            else:
-                # Fallback to default value (usually en_US)
-                record_with_lang = record.with_context(lang=lang.code)
-                translations[lang.code] = record_with_lang[field_name] or ''
-
-        return translations
+        self.flush_model(field_names)
+        self.env.cr.execute(SQL(
+            "SELECT id, %s FROM %s WHERE id IN %s",
+            SQL(', ').join(SQL.identifier(fname) for fname in field_names),
+            SQL.identifier(self._table),
+            res_ids,
+        ))
+
+        result = {}
+        for res_id, *values in self.env.cr.fetchall():
+            result[res_id] = record_values = {}
+            for field_name, value in zip(field_names, values):
+                if self._fields[field_name].translate:
+                    # Translated columns are JSONB {lang: value}
+                    value = value or {}
+                    record_values[field_name] = {lang: value.get(lang) or value.get('en_US') or '' for lang in langs}
+                else:
+                    record_values[field_name] = {lang: value or '' for lang in langs}
+        return result
 
     @api.model
     def update_field_translation(self, res_id, field_name, lang, value):
@@ -43,29 +62,52 @@ class CmsTranslationMixin(models.AbstractModel):
         if not record.exists():
             raise UserError("Record not found")
 
-        # Update or create translation
-        translation = self.env['ir.translation'].search([
-            ('type', '=', 'model'),
-            ('name', '=', f'{self._name},{field_name}'),
-            ('res_id', '=', res_id),
-            ('lang', '=', lang),
-        ], limit=1)
+        self.update_field_translations_multi([(res_id, field_name, lang, value)])
+        return True
 
-        if translation:
-            translation.value = value
-        else:
-            self.env['ir.translation'].create({
-                'type': 'model',
-                'name': f'{self._name},{field_name}',
-                'res_id': res_id,
-                'lang': lang,
-                'src': record[field_name],  # Source value (en_US)
-                'value': value,
-                'module': 'cms_sarkande',
-                'state': 'translated',
-            })
+    @api.model
+    def update_field_translations_multi(self, values):
+        """Write many translations at once.
 
-        return True
+        values is an iterable of (res_id, field_name, lang, value). The new
+        languages are merged into the JSONB columns with one UPDATE per field.
+        """
+        translations = defaultdict(lambda: defaultdict(dict))
+        for res_id, field_name, lang, value in values:
+            field = self._fields[field_name]
+            if not field.translate:
+                raise UserError(f"Field {field_name} of {self._name} is not translatable")
+            # Same conversion as a regular write (e.g. HTML sanitization)
+            value = field.convert_to_cache(value, self.browse(res_id))
+            translations[field_name][res_id][lang] = str(value) if value else None
+        if not translations:
+            return
+
+        self.flush_model(list(translations))
+        for field_name, values_by_id in translations.items():
+            self.env.cr.execute(SQL(
+                """UPDATE %(table)s t
+                      SET %(column)s = COALESCE(t.%(column)s, '{}'::jsonb) || v.translations,
+                          write_uid = %(uid)s,
+                          write_date = now() at time zone 'UTC'
+                     FROM (VALUES %(values)s) AS v(id, translations)
+                    WHERE t.id = v.id""",
+                table=SQL.identifier(self._table),
+                column=SQL.identifier(field_name),
+                uid=self.env.uid,
+                values=SQL(', ').join(
+                    SQL('(%s, %s::jsonb)', res_id, json.dumps(langs))
+                    for res_id, langs in values_by_id.items()
+                ),
+            ))
+        self.invalidate_model(list(translations) + ['write_uid', 'write_date'])
+
+        res_ids = {res_id for values_by_id in translations.values() for res_id in values_by_id}
+        self.browse(res_ids)._translations_updated()
+
+    def _translations_updated(self):
+        """Hook called after update_field_translations_multi wrote on these records"""
+        return
 
     def auto_translate_field(self, res_id=None, field_name=None):
         """Traduit automatiquement un champ via IAP (Google Translate)"""
@@ -90,26 +132,11 @@ class CmsTranslationMixin(models.AbstractModel):
             ('code', '!=', 'en_US'),
         ])
 
-        # Get IAP account for translation
-        try:
-            iap_account = self.env['iap.account'].get('translation')
-        except Exception:
-            raise UserError(
-                "Service de traduction non configuré. "
-                "Vérifiez votre compte IAP dans les paramètres."
-            )
+        service = self._get_translation_service()
 
         for lang in languages:
             try:
-                # Call IAP translation service
-                params = {
-                    'texts': [source_text],
-                    'source_language': 'en',
-                    'target_language': self._get_iap_lang_code(lang.code),
-                }
-
-                result = iap_account.call('translator_translate', params)
-                translated_text = result[0] if result else source_text
+                translated_text = self._iap_translate_texts([source_text], lang.code, service=service)[0]
 
                 # Store translation
                 self.update_field_translation(record.id, field_name, lang.code, translated_text)
@@ -126,6 +153,80 @@ class CmsTranslationMixin(models.AbstractModel):
 
         return True
 
+    @api.model
+    def _get_translation_service(self):
+        """Return a callable sending one translator_translate request.
+
+        The system parameter cms_sarkande.translation_endpoint replaces the IAP
+        service by a JSON-RPC endpoint, given as an absolute URL, e.g.
+        http://localhost:8069/cms_sarkande/fake_iap/translate for tests (see
+        controllers/fake_iap.py).
+        """
+        endpoint = self.env['ir.config_parameter'].sudo().get_param('cms_sarkande.translation_endpoint')
+        if endpoint:
+            return lambda params: iap_tools.iap_jsonrpc(endpoint, params=params)
+
+        # Get IAP account for translation
+        try:
+            iap_account = self.env['iap.account'].get('translation')
+        except Exception:
+            raise UserError(
+                "Service de traduction non configuré. "
+                "Vérifiez votre compte IAP dans les paramètres."
+            )
+        return lambda params: iap_account.call('translator_translate', params)
+
+    @api.model
+    def _iap_translate_texts(self, texts, lang_code, service=None, source_lang_code='en_US', on_batch=None, stats=None):
+        """Translate a list of texts, sending them in size-bounded batches.
+
+        Texts found in the translation memory are not sent; machine
+        translations are added to it. Returns the translations in the same
+        order as texts. on_batch, if given, is called with the number of
+        texts translated so far; stats, if given, receives the memory
+        'hits' and 'misses'.
+        """
+        memory = self.env['cms.translation.memory'].sudo()
+        translated = memory._lookup(texts, source_lang_code, lang_code)
+        missing = [text for text in dict.fromkeys(texts) if text not in translated]
+        if stats is not None:
+            stats['hits'] = stats.get('hits', 0) + len(translated)
+            stats['misses'] = stats.get('misses', 0) + len(missing)
+
+        if missing:
+            service = service or self._get_translation_service()
+        for batch in self._split_translation_batches(missing):
+            result = service({
+                'texts': batch,
+                'source_language': self._get_iap_lang_code(source_lang_code),
+                'target_language': self._get_iap_lang_code(lang_code),
+            }) or []
+            # Only real results go to the memory: a missing one is asked again next time
+            batch_translations = {text: result[i] for i, text in enumerate(batch) if i < len(result) and result[i]}
+            memory._store(batch_translations, source_lang_code, lang_code)
+            # Keep the source text for any missing result
+            translated.update({text: batch_translations.get(text, text) for text in batch})
+            if on_batch:
+                on_batch(len(translated))
+        return [translated[text] for text in texts]
+
+    @api.model
+    def _split_translation_batches(self, texts):
+        """Split texts into batches bounded by count and total length"""
+        icp = self.env['ir.config_parameter'].sudo()
+        max_texts = int(icp.get_param('cms_sarkande.translation_batch_size', 100))
+        max_chars = int(icp.get_param('cms_sarkande.translation_batch_chars', 20000))
+
+        batch, batch_chars = [], 0
+        for text in texts:
+            if batch and (len(batch) >= max_texts or batch_chars + len(text) > max_chars):
+                yield batch
+                batch, batch_chars = [], 0
+            batch.append(text)
+            batch_chars += len(text)
+        if batch:
+            yield batch
+
     @staticmethod
     def _get_iap_lang_code(odoo_lang_code):
         """Convertit un code langue Odoo en code langue IAP"""
@@ -0,0 +1,94 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { Component, onMounted, useRef } from "@odoo/owl";
+import { useService } from "@web/core/utils/hooks";
+import { useRecordObserver } from "@web/model/relational_model/utils";
+import { buildPreviewDocument, CmsPreviewModal } from "./cms_preview_modal";
+
+export class CmsPreview extends Component {
+    static template = "cms_sarkande.CmsPreview";
+    static props = ["*"];
+
+    setup() {
+        this.dialog = useService("dialog");
+        this.iframeRef = useRef("iframe");
+        // Last fragment received for each block, and blocks displayed in the iframe
+        this.fragments = new Map();
+        this.displayed = new Map();
+        this.blockIds = [];
+
+        // The server only sends the HTML of the blocks whose version is not displayed
+        useRecordObserver((record) => {
+            this.onFragments(record, record.data.preview_fragments || []);
+        });
+
+        onMounted(() => {
+            this.load(this.blockIds);
+        });
+    }
+
+    get previewHtml() {
+        const blocks = this.blockIds.map((blockId) => this.fragments.get(blockId).html);
+        return `<div class="cms-page-preview">${blocks.join("\n")}</div>`;
+    }
+
+    onFragments(record, fragments) {
+        for (const fragment of fragments) {
+            if (fragment.html !== undefined) {
+                this.fragments.set(fragment.block_id, fragment);
+            }
+        }
+        // Blocks sent without HTML are the ones displayed already
+        this.blockIds = fragments
+            .filter((fragment) => this.fragments.get(fragment.block_id)?.version === fragment.version)
+            .map((fragment) => fragment.block_id);
+        this.patchIframe();
+
+        // Tell the server which versions are displayed, for the next onchange
+        const versions = Object.fromEntries(this.blockIds.map((blockId) => [blockId, this.fragments.get(blockId).version]));
+        if (JSON.stringify(versions) !== JSON.stringify(this.sentVersions || {})) {
+            this.sentVersions = versions;
+            record.update({ preview_versions: versions });
+        }
+    }
+
+    load(blockIds) {
+        const iframe = this.iframeRef.el;
+        if (!iframe) return;
+
+        this.displayed = new Map(blockIds.map((blockId) => [blockId, this.fragments.get(blockId).version]));
+        iframe.srcdoc = buildPreviewDocument(this.previewHtml);
+    }
+
+    patchIframe() {
+        const iframe = this.iframeRef.el;
+        const doc = iframe && iframe.contentDocument;
+        if (!doc || !doc.body) return;
+
+        // Blocks added, removed or moved: reload the whole preview
+        if (this.blockIds.join(",") !== [...this.displayed.keys()].join(",")) {
+            this.load(this.blockIds);
+            return;
+        }
+
+        for (const blockId of this.blockIds) {
+            const fragment = this.fragments.get(blockId);
+            if (this.displayed.get(blockId) === fragment.version) continue;
+            const element = doc.querySelector(`[data-block-id="${blockId}"]`);
+            if (element) {
+                element.outerHTML = fragment.html;
+            }
+            this.displayed.set(blockId, fragment.version);
+        }
+    }
+
+    onFullScreen(ev) {
+        ev.preventDefault();
+        ev.stopPropagation();
+        this.dialog.add(CmsPreviewModal, { previewHtml: this.previewHtml });
+    }
+}
+
+// Register as a widget
+registry.category("view_widgets").add("cms_preview", { component: CmsPreview });
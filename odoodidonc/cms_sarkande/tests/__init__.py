@@ -0,0 +1,2 @@
+from . import test_page_serializer
+from . import test_query_plans
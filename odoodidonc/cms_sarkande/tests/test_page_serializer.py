@@ -0,0 +1,57 @@
+from odoo.tests import TransactionCase, tagged
+
+# One block of each content type (user_list blocks read their users on their own)
+BLOCK_VALUES = [
+    {'block_type': 'heading', 'heading_text': 'Heading', 'heading_level': 'h2'},
+    {'block_type': 'text', 'text_content': 'Some text'},
+    {'block_type': 'html', 'html_content': '<p>Some <b>HTML</b></p>'},
+    {'block_type': 'image', 'image_url': '/logo.png', 'image_alt': 'Logo'},
+    {'block_type': 'hero', 'hero_title': 'Title', 'hero_subtitle': 'Subtitle', 'hero_button_text': 'Go',
+     'hero_button_url': '/'},
+]
+
+
+@tagged('post_install', '-at_install')
+class TestPageSerializer(TransactionCase):
+
+    def _create_pages(self, page_count, blocks_per_page):
+        pages = self.env['cms.page'].create([
+            {'name': f'Page {i}', 'slug': f'serializer-{page_count}x{blocks_per_page}-{i}'}
+            for i in range(page_count)
+        ])
+        self.env['cms.block'].create([
+            dict(BLOCK_VALUES[j % len(BLOCK_VALUES)], name=f'Block {j}', page_id=page.id, sequence=j)
+            for page in pages for j in range(blocks_per_page)
+        ])
+        self.env.flush_all()
+        return pages
+
+    def _count_queries(self, pages):
+        self.env.invalidate_all()
+        count = self.env.cr.sql_log_count
+        pages.get_pages_data()
+        return self.env.cr.sql_log_count - count
+
+    def test_get_pages_data(self):
+        page = self._create_pages(1, len(BLOCK_VALUES))
+        self.env.invalidate_all()
+        [data] = page.get_pages_data()
+        self.assertEqual(data['slug'], page.slug)
+        self.assertEqual([block['type'] for block in data['blocks']], [vals['block_type'] for vals in BLOCK_VALUES])
+        heading, text, html, image, hero = data['blocks']
+        self.assertEqual((heading['text'], heading['level']), ('Heading', 'h2'))
+        self.assertEqual(text['content'], 'Some text')
+        self.assertEqual(html['content'], '<p>Some <b>HTML</b></p>')
+        self.assertEqual((image['url'], image['alt']), ('/logo.png', 'Logo'))
+        self.assertEqual((hero['title'], hero['subtitle'], hero['buttonText']), ('Title', 'Subtitle', 'Go'))
+
+    def test_query_count(self):
+        """The number of queries depends neither on the number of pages nor of blocks"""
+        small = self._create_pages(1, len(BLOCK_VALUES))
+        large = self._create_pages(20, 4 * len(BLOCK_VALUES))
+        expected = self._count_queries(small)
+
+        self.env.invalidate_all()
+        with self.assertQueryCount(expected):
+            data = large.get_pages_data()
+        self.assertEqual([len(page_data['blocks']) for page_data in data], [4 * len(BLOCK_VALUES)] * 20)
@@ -0,0 +1,122 @@
+import json
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import SQL
+
+PAGES = 2000
+BLOCKS_PER_PAGE = 50
+KEYS = 2000
+LANGS = 30
+
+INDEX_SCANS = ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan')
+
+
+@tagged('post_install', '-at_install')
+class TestQueryPlans(TransactionCase):
+    """The read paths of the API use their indexes on 100k blocks"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cr = cls.env.cr
+        cr.execute("""
+            INSERT INTO cms_page (name, slug, sequence, active, show_in_navigation)
+            SELECT 'Page ' || i, 'plan-page-' || i, i, i %% 10 <> 0, i %% 3 = 0
+              FROM generate_series(1, %s) i
+            RETURNING id
+        """, [PAGES])
+        page_ids = [row[0] for row in cr.fetchall()]
+        cls.page_id = page_ids[len(page_ids) // 2]
+        cr.execute("""
+            INSERT INTO cms_block (name, page_id, block_type, sequence, active)
+            SELECT 'Block ' || j, p.id,
+                   (ARRAY['heading', 'text', 'html', 'image', 'hero', 'user_list'])[1 + (p.id + j) %% 6],
+                   j, j %% 20 <> 0
+              FROM unnest(%s::int[]) p(id), generate_series(1, %s) j
+        """, [page_ids, BLOCKS_PER_PAGE])
+        cr.execute("""
+            INSERT INTO cms_translation_key (key, active)
+            SELECT 'plan.key.' || i, true FROM generate_series(1, %s) i
+            RETURNING id
+        """, [KEYS])
+        key_ids = [row[0] for row in cr.fetchall()]
+        cr.execute("""
+            INSERT INTO cms_translation_line (translation_key_id, lang_id, lang, value, active)
+            SELECT k.id, l.id, l.code, l.code || ' ' || k.id, true
+              FROM unnest(%s::int[]) k(id)
+              JOIN (SELECT id, code FROM res_lang ORDER BY code <> 'en_US', active DESC, id LIMIT %s) l ON true
+            ON CONFLICT DO NOTHING
+        """, [key_ids, LANGS])
+        cr.execute("ANALYZE cms_page; ANALYZE cms_block; ANALYZE cms_translation_key; ANALYZE cms_translation_line")
+        cls.env.invalidate_all()
+
+    def _get_index_scans(self, plan):
+        """(node type, index name) of the index scans of an EXPLAIN (FORMAT JSON) plan"""
+        scans = {(plan['Node Type'], plan['Index Name'])} if plan['Node Type'] in INDEX_SCANS else set()
+        for child in plan.get('Plans', []):
+            scans |= self._get_index_scans(child)
+        return scans
+
+    def _capture_query(self, marker, method, *args, **kwargs):
+        """Call method and return the query it executed whose code contains marker, as SQL"""
+        cr = self.env.cr
+        execute = cr.execute
+        queries = []
+
+        def capture(query, params=None, log_exceptions=True):
+            queries.append(query if isinstance(query, SQL) else SQL(query, *params) if isinstance(params, (list, tuple))
+                           else SQL(query, **(params or {})))
+            return execute(query, params, log_exceptions)
+
+        self.env.invalidate_all()
+        with patch.object(cr, 'execute', capture):
+            method(*args, **kwargs)
+        matching = [query for query in queries if marker in query.code]
+        self.assertTrue(matching, f"{method.__name__} executed no query containing {marker!r}")
+        return matching[0]
+
+    def assertIndexScan(self, query, *index_names):
+        """Assert that the plan of query scans one of index_names"""
+        self.env.cr.execute(SQL("EXPLAIN (FORMAT JSON) %s", query))
+        plan = self.env.cr.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        scans = self._get_index_scans(plan[0]['Plan'])
+        self.assertTrue(
+            any(index_name in index_names for _node_type, index_name in scans),
+            f"None of {', '.join(index_names)} is scanned, plan:\n{json.dumps(plan, indent=2)}")
+
+    def test_page_by_slug(self):
+        """cms.page._get_page_version"""
+        query = self._capture_query('FROM cms_page p', self.env['cms.page']._get_page_version, f'plan-page-{PAGES // 2 + 1}')
+        self.assertIndexScan(query, 'cms_page_slug_unique', 'cms_page__slug_index')
+        self.assertIndexScan(query, 'cms_block_page_user_list_index')
+
+    def test_pages_list(self):
+        """cms.page.get_pages_list, first page and after a cursor"""
+        pages = self.env['cms.page']
+        query = self._capture_query('ORDER BY sequence, id', pages.get_pages_list, limit=50)
+        self.assertIndexScan(query, 'cms_page_active_sequence_index')
+        query = self._capture_query('ORDER BY sequence, id', pages.get_pages_list, after=(PAGES // 2, 0), limit=50)
+        self.assertIndexScan(query, 'cms_page_active_sequence_index')
+
+    def test_blocks_of_page(self):
+        """cms.page.get_pages_data"""
+        page = self.env['cms.page'].browse(self.page_id)
+        query = self._capture_query('"page_id" IN', page.get_pages_data)
+        self.assertIndexScan(query, 'cms_block_page_active_sequence_index')
+
+    def test_blocks_of_component(self):
+        """cms.block.component._get_blocks"""
+        title = self.env['cms.block.title'].create({'title': 'Title'})
+        query = self._capture_query('"heading_title_id" IN', title._get_blocks)
+        self.assertIndexScan(query, 'cms_block__heading_title_id_index')
+
+    def test_translations(self):
+        """cms.translation.key._get_translations_cached"""
+        self.env.cr.execute("SELECT lang FROM cms_translation_line WHERE lang <> 'en_US' LIMIT 1")
+        [lang] = self.env.cr.fetchone()
+        self.env.registry.clear_cache()
+        query = self._capture_query('cms_translation_line target', self.env['cms.translation.key'].get_translations, lang)
+        self.assertIndexScan(query, 'cms_translation_line_lang_key_index')
@@ -0,0 +1,6 @@
+from . import lru
+from . import page_cache
+from . import page_render
+from . import serializers
+from . import static_build
+from . import static_engine
@@ -0,0 +1,81 @@
+"""Cache des pages CMS sérialisées, partagé par les requêtes d'un même worker.
+
+Each entry is keyed by (dbname, slug, lang, format) and remembers the page id and the
+content version it was built from. Since the current version is read from the
+database on every request, an entry written by this worker is never served
+once another worker has saved the page.
+"""
+import time
+
+from odoo.tools import config
+
+from .lru import LRUCache
+
+
+class PageCache:
+    """Bounded LRU mapping (dbname, slug, lang, fmt) -> ((page_id, version), content)"""
+
+    def __init__(self, size):
+        self._entries = LRUCache(size)
+
+    def get(self, dbname, slug, lang, page_id, version, fmt='json'):
+        """Return the cached content for this page version, or None"""
+        entry = self._entries.get((dbname, slug, lang, fmt))
+        if entry is None or entry[0] != (page_id, version):
+            return None
+        return entry[1]
+
+    def put(self, dbname, slug, lang, page_id, version, content, fmt='json'):
+        self._entries.put((dbname, slug, lang, fmt), ((page_id, version), content))
+
+    def invalidate(self, dbname, page_ids):
+        """Drop the entries of the given pages, in every language and format"""
+        page_ids = set(page_ids)
+        self._entries.discard_if(lambda key, entry: key[0] == dbname and entry[0][0] in page_ids)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class VersionedCache:
+    """Bounded LRU mapping key -> (version, content), an entry being served only for its version"""
+
+    def __init__(self, size):
+        self._entries = LRUCache(size)
+
+    def get(self, key, version):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def put(self, key, version, content):
+        self._entries.put(key, (version, content))
+
+    def clear(self):
+        self._entries.clear()
+
+
+class TTLCache:
+    """Bounded LRU whose entries expire ttl seconds after being stored"""
+
+    def __init__(self, size):
+        self._entries = LRUCache(size)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def put(self, key, content, ttl):
+        self._entries.put(key, (time.monotonic() + ttl, content))
+
+    def clear(self):
+        self._entries.clear()
+
+
+page_cache = PageCache(int(config.get('cms_page_cache_size', 512)))
+listing_cache = VersionedCache(int(config.get('cms_listing_cache_size', 128)))
+translations_cache = VersionedCache(int(config.get('cms_translations_cache_size', 64)))
+user_list_cache = TTLCache(int(config.get('cms_user_list_cache_size', 256)))
@@ -0,0 +1,126 @@
+"""Rendu HTML côté serveur des pages CMS, à l'identique de BlockRenderer.tsx.
+
+The markup and CSS module classes match what the Next.js components render,
+so the browser paints the page from the first response and React hydrates
+it without a visible change. The class names are read from the CSS of the
+exported bundle, since the build hashes them.
+"""
+import json
+import re
+
+from markupsafe import Markup, escape
+
+# .HeroBlock-module-scss-module__f8qrTq__heroBlock -> ('HeroBlock', 'heroBlock')
+CSS_MODULE_CLASS_RE = re.compile(r'\.((\w+)-module(?:-scss-module)?__[\w-]{6}__(\w+))')
+
+# Paragraphe "Chargement de la page..." affiché par le shell exporté
+SHELL_PLACEHOLDER_RE = re.compile(r'<p>[^<]*</p>(?=</main>)')
+
+HEADING_LEVELS = ('h1', 'h2', 'h3', 'h4')
+
+# Caractères qui permettraient de sortir de url(...) dans l'attribut style
+CSS_URL_UNSAFE_RE = re.compile(r'[\s"\'()\\;]')
+
+
+def parse_css_modules(css):
+    """Map (component, local class) to the hashed class name of the build"""
+    return {(component, local): name for name, component, local in CSS_MODULE_CLASS_RE.findall(css)}
+
+
+class PageRenderer:
+    """Render page data (cms.page.get_page_data) into the exported [slug].html shell"""
+
+    def __init__(self, shell, css_modules, version):
+        self.shell = shell
+        self.css_modules = css_modules
+        # Changes with the build: snapshots rendered from another shell are stale
+        self.version = version
+
+    def css(self, component, *local_names):
+        return ' '.join(self.css_modules.get((component, name), name) for name in local_names)
+
+    def render(self, page_data, lang, translations):
+        """Full HTML document of the page, None if the shell has no place for the blocks"""
+        if not SHELL_PLACEHOLDER_RE.search(self.shell):
+            return None
+        blocks = Markup('').join(self.render_block(block, translations) for block in page_data['blocks'])
+        body = Markup('<div style="width:100%;max-width:1200px;padding:0 1rem">{}</div>').format(blocks)
+        head = Markup('<title>{}</title><meta name="description" content="{}"/>').format(
+            page_data['title'], page_data['meta_description'])
+        # Données de la page pour l'hydratation, sans refaire l'appel API
+        data = json.dumps({'lang': lang, 'page': page_data}, ensure_ascii=False).replace('<', '\\u003c')
+        script = Markup('<script id="__CMS_PAGE__" type="application/json">{}</script>').format(Markup(data))
+
+        html = SHELL_PLACEHOLDER_RE.sub(lambda match: body, self.shell, count=1)
+        html = html.replace('<html lang="en">', f'<html lang="{escape(lang.replace("_", "-"))}">', 1)
+        html = html.replace('</head>', f'{head}</head>', 1)
+        return html.replace('</body>', f'{script}</body>', 1)
+
+    def render_block(self, block, translations):
+        renderer = getattr(self, f'_render_{block["type"]}', None)
+        if renderer is None:
+            return Markup(
+                '<div style="padding:1rem;background:#fff3cd;border:1px solid #ffc107;border-radius:4px">'
+                '<strong>Unknown block type:</strong> {}</div>'
+            ).format(block['type'])
+        return renderer(block, translations)
+
+    def _render_html(self, block, translations):
+        # Contenu déjà assaini par le champ Html du composant
+        return Markup('<div class="{}">{}</div>').format(
+            self.css('HtmlBlock', 'htmlBlock'), Markup(block.get('content') or ''))
+
+    def _render_text(self, block, translations):
+        return Markup('<div class="{}"><p>{}</p></div>').format(
+            self.css('TextBlock', 'textBlock'), block.get('content') or '')
+
+    def _render_heading(self, block, translations):
+        level = block.get('level') if block.get('level') in HEADING_LEVELS else 'h2'
+        return Markup('<{level} class="{css}">{text}</{level}>').format(
+            level=Markup(level), css=self.css('HeadingBlock', level), text=block.get('text') or '')
+
+    def _render_image(self, block, translations):
+        return Markup('<div class="{}"><img src="{}" alt="{}"/></div>').format(
+            self.css('ImageBlock', 'imageBlock'), block.get('url') or '', block.get('alt') or '')
+
+    def _render_hero(self, block, translations):
+        if block.get('backgroundImage'):
+            url = CSS_URL_UNSAFE_RE.sub('', block['backgroundImage'])
+            background = f'linear-gradient(rgba(0,0,0,0.5), rgba(0,0,0,0.5)), url({url})'
+        else:
+            background = 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)'
+        button = Markup('')
+        if block.get('buttonText') and block.get('buttonUrl'):
+            button = Markup('<a href="{}" class="{}">{}</a>').format(
+                block['buttonUrl'], self.css('HeroBlock', 'heroButton'), block['buttonText'])
+        return Markup('<div class="{}" style="background:{}"><h1>{}</h1><p class="{}">{}</p>{}</div>').format(
+            self.css('HeroBlock', 'heroBlock'), background, block.get('title') or '',
+            self.css('HeroBlock', 'subtitle'), block.get('subtitle') or '', button)
+
+    def _render_user_list(self, block, translations):
+        def t(key):
+            return translations.get(key, key)
+
+        cards = []
+        for user in block.get('users') or []:
+            email = Markup('')
+            if user['email']:
+                email = Markup('<p class="{}"><strong>{}:</strong> {}</p>').format(
+                    self.css('UserListBlock', 'userInfo'), t('user.email'), user['email'])
+            status = 'active' if user['active'] else 'inactive'
+            status_text = f'● {t("user.active")}' if user['active'] else f'○ {t("user.inactive")}'
+            cards.append(Markup(
+                '<div class="{card}"><h4>{name}</h4><p class="{info}"><strong>{login_label}:</strong> {login}</p>'
+                '{email}<p class="{status}">{status_text}</p></div>'
+            ).format(
+                card=self.css('UserListBlock', 'userCard'), name=user['name'],
+                info=self.css('UserListBlock', 'userInfo'), login_label=t('user.login'), login=user['login'],
+                email=email, status=self.css('UserListBlock', 'userStatus', status), status_text=status_text,
+            ))
+        load_more = Markup('')
+        if block.get('next') is not None:
+            load_more = Markup('<button type="button" class="{}">{}</button>').format(
+                self.css('UserListBlock', 'loadMore'), t('block.load_more'))
+        return Markup('<div class="{}"><h3>{}</h3><div class="{}">{}</div>{}</div>').format(
+            self.css('UserListBlock', 'userListBlock'), t('block.team_members'),
+            self.css('UserListBlock', 'userGrid'), Markup('').join(cards), load_more)
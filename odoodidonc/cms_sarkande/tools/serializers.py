@@ -0,0 +1,96 @@
+"""Encodage des réponses de l'API CMS (schéma : doc/api_formats.md).
+
+Three formats, chosen per request:
+
+- ``json``: plain JSON, written straight to bytes (orjson when installed),
+- ``columnar``: JSON where every list of objects becomes
+  ``{"columns": [...], "rows": [[...], ...]}``, so keys are not repeated,
+- ``msgpack``: MessagePack, when the msgpack package is installed.
+
+Parts of a response are encoded separately and cached, then joined into
+the envelope with ``encode_map`` without being decoded again.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FORMATS = {
+    'json': 'application/json',
+    'columnar': 'application/vnd.cms.columnar+json',
+    'msgpack': 'application/msgpack',
+}
+
+# Autres types MIME acceptés pour un même format
+MIMETYPE_ALIASES = {
+    'application/x-msgpack': 'msgpack',
+}
+
+
+def get_available_formats():
+    """Formats usable in this worker, in order of preference"""
+    return [fmt for fmt in FORMATS if fmt != 'msgpack' or msgpack is not None]
+
+
+def negotiate(accept_mimetypes, requested=None):
+    """Format of a response from ?format= or the Accept header, None if not available"""
+    available = get_available_formats()
+    if requested:
+        return requested if requested in available else None
+    mimetypes = [FORMATS[fmt] for fmt in available]
+    mimetypes += [alias for alias, fmt in MIMETYPE_ALIASES.items() if fmt in available]
+    best = accept_mimetypes.best_match(mimetypes, default=FORMATS['json'])
+    return MIMETYPE_ALIASES.get(best) or next(fmt for fmt, mimetype in FORMATS.items() if mimetype == best)
+
+
+def to_columnar(value):
+    """Turn every list of objects of value into {"columns": [...], "rows": [...]}"""
+    if isinstance(value, list):
+        if value and all(isinstance(item, dict) for item in value):
+            columns = list(dict.fromkeys(key for item in value for key in item))
+            return {
+                'columns': columns,
+                'rows': [[to_columnar(item.get(column)) for column in columns] for item in value],
+            }
+        return [to_columnar(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_columnar(item) for key, item in value.items()}
+    return value
+
+
+def dumps_json(value):
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def encode(value, fmt='json'):
+    """Encode a value in one of the FORMATS, as bytes"""
+    if fmt == 'msgpack':
+        return msgpack.packb(value, use_bin_type=True)
+    if fmt == 'columnar':
+        return dumps_json(to_columnar(value))
+    return dumps_json(value)
+
+
+def encode_map(items, fmt='json'):
+    """Encode an object from (key, already encoded value) pairs"""
+    if fmt == 'msgpack':
+        return _msgpack_map_header(len(items)) + b''.join(
+            msgpack.packb(key, use_bin_type=True) + value for key, value in items)
+    return b'{' + b','.join(dumps_json(key) + b':' + value for key, value in items) + b'}'
+
+
+def _msgpack_map_header(size):
+    if size < 16:
+        return bytes([0x80 | size])
+    if size < 0x10000:
+        return b'\xde' + size.to_bytes(2, 'big')
+    return b'\xdf' + size.to_bytes(4, 'big')
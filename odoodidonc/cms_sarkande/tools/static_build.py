@@ -0,0 +1,120 @@
+"""Précompression du front Next.js exporté et génération de son manifeste.
+
+Writes ``.gz`` and ``.br`` siblings next to every compressible asset and an
+``asset-manifest.json`` describing each file: size, sha256, MIME type, the
+size of every encoded variant and the preferred encoding. The static engine
+loads that manifest instead of guessing types and compressing at startup.
+
+Only the standard library (and brotli when installed) is used, so the build
+can run outside Odoo::
+
+    python3 tools/static_build.py static/front
+
+or through Odoo's CLI: ``odoo-bin cms_build_static``.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = 'asset-manifest.json'
+MANIFEST_VERSION = 1
+
+ENCODING_SUFFIXES = {'.br': 'br', '.gz': 'gzip'}
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+
+def compress(content, encoding, best=False):
+    """Encoded content, None when the encoding is not available"""
+    if encoding == 'gzip':
+        return gzip.compress(content, compresslevel=9, mtime=0)
+    if encoding == 'br' and brotli is not None:
+        return brotli.compress(content, quality=11 if best else 9)
+    return None
+
+
+def iter_assets(root):
+    """Relative path and absolute path of every servable file of the tree"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if not name.startswith('.'))
+        for filename in sorted(filenames):
+            if filename.startswith('.') or filename == MANIFEST_NAME \
+                    or os.path.splitext(filename)[1] in ENCODING_SUFFIXES:
+                continue
+            path = os.path.join(dirpath, filename)
+            yield os.path.relpath(path, root).replace(os.sep, '/'), path
+
+
+def build_asset(path):
+    """Write the encoded siblings of one file and return its manifest entry"""
+    with open(path, 'rb') as f:
+        content = f.read()
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    encodings = {}
+    if content_type.startswith(COMPRESSIBLE_TYPES):
+        for suffix, encoding in ENCODING_SUFFIXES.items():
+            sibling = path + suffix
+            compressed = compress(content, encoding, best=True)
+            # Un variant plus gros que l'original ne sert à rien
+            if compressed is None or len(compressed) >= len(content):
+                if os.path.exists(sibling):
+                    os.remove(sibling)
+                continue
+            with open(sibling, 'wb') as f:
+                f.write(compressed)
+            encodings[encoding] = len(compressed)
+    return {
+        'size': len(content),
+        'hash': hashlib.sha256(content).hexdigest(),
+        'content_type': content_type,
+        'encodings': encodings,
+        'preferred': min(encodings, key=encodings.get) if encodings else 'identity',
+    }
+
+
+def build(root):
+    """Precompress the whole tree and write its manifest, return the manifest"""
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'files': {relative_path: build_asset(path) for relative_path, path in iter_assets(root)},
+    }
+    with open(os.path.join(root, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return manifest
+
+
+def load_manifest(root):
+    """Manifest of the tree, None when it was never built"""
+    try:
+        with open(os.path.join(root, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def main(argv):
+    if len(argv) != 1:
+        sys.stderr.write(f'usage: {os.path.basename(sys.argv[0])} <static/front>\n')
+        return 2
+    manifest = build(argv[0])
+    files = manifest['files'].values()
+    original = sum(entry['size'] for entry in files)
+    encoded = sum(entry['encodings'].get(entry['preferred'], entry['size']) for entry in files)
+    sys.stdout.write(f'{len(files)} assets, {original} bytes, {encoded} bytes with preferred encodings'
+                     + ('' if brotli else ' (brotli not installed, gzip only)') + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,211 @@
+"""Moteur de fichiers statiques pour le front Next.js exporté (static/front).
+
+The tree is indexed once per worker, the first time it is used. After that,
+requests never touch the filesystem:
+
+- files up to ``cms_static_inline_max`` bytes are held in memory,
+- larger files are memory-mapped,
+- the asset manifest written by tools/static_build.py gives the MIME type,
+  hash, precompressed ``.gz``/``.br`` siblings and preferred encoding of
+  each file. Files missing from the manifest, or changed since it was
+  built, are described and compressed while indexing instead.
+
+A new bundle copied by build.sh is picked up when the workers restart.
+"""
+import hashlib
+import mimetypes
+import mmap
+import os
+import threading
+from datetime import datetime, timezone
+
+from odoo.modules.module import get_module_path
+from odoo.tools import config
+
+from .page_render import PageRenderer, parse_css_modules
+from .static_build import COMPRESSIBLE_TYPES, ENCODING_SUFFIXES, MANIFEST_NAME, compress, load_manifest
+
+MODULE_NAME = 'cms_sarkande'
+
+PAGE_SHELL = '[slug].html'
+
+# Préférence du serveur quand le client accepte plusieurs encodages
+ENCODINGS = ('br', 'gzip')
+
+# Next.js puts a content hash in the name of everything under these folders
+IMMUTABLE_PREFIXES = ('_next/static/chunks/', '_next/static/media/')
+
+CACHE_CONTROL_IMMUTABLE = 'public, max-age=31536000, immutable'
+CACHE_CONTROL_HTML = 'no-cache'
+CACHE_CONTROL_DEFAULT = 'public, max-age=3600'
+
+
+class StaticAsset:
+    """One file of the bundle with its encoded variants.
+
+    ``variants`` maps an encoding ('identity', 'gzip', 'br') to the body,
+    either bytes or a read-only mmap, and ``encodings`` lists the compressed
+    ones from the most to the least preferred.
+    """
+
+    __slots__ = ('path', 'content_type', 'etag', 'last_modified', 'cache_control', 'variants', 'encodings')
+
+    def __init__(self, path, content_type, etag, last_modified, cache_control, variants, preferred=None):
+        self.path = path
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.cache_control = cache_control
+        self.variants = variants
+        self.encodings = sorted(
+            (encoding for encoding in variants if encoding != 'identity'),
+            key=lambda encoding: (encoding != preferred, ENCODINGS.index(encoding)),
+        )
+
+    def select_encoding(self, accept_encodings):
+        """Best encoding accepted by the client, 'identity' when none is"""
+        for encoding in self.encodings:
+            if accept_encodings[encoding]:
+                return encoding
+        return 'identity'
+
+    def get_etag(self, encoding):
+        """Strong ETag of one representation of the file"""
+        return self.etag if encoding == 'identity' else f'{self.etag}-{encoding}'
+
+
+class StaticEngine:
+    """In-memory index of a static tree, relative path -> StaticAsset"""
+
+    def __init__(self, root, inline_max):
+        self.root = root
+        self.inline_max = inline_max
+        self.assets = {}
+        self.page_renderer = None
+        self.index()
+
+    def get(self, relative_path):
+        return self.assets.get(relative_path)
+
+    def get_page_renderer(self):
+        """Renderer of CMS pages into the exported page shell, None without shell"""
+        if self.page_renderer is None and PAGE_SHELL in self.assets:
+            shell = self.assets[PAGE_SHELL]
+            css = ''.join(
+                asset.variants['identity'][:].decode()
+                for asset in self.assets.values() if asset.content_type == 'text/css'
+            )
+            self.page_renderer = PageRenderer(
+                shell.variants['identity'][:].decode(), parse_css_modules(css), shell.etag)
+        return self.page_renderer
+
+    def index(self):
+        manifest = load_manifest(self.root)
+        entries = manifest['files'] if manifest else {}
+        assets = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+            filenames = set(filenames)
+            for filename in filenames:
+                if filename.startswith('.') or filename == MANIFEST_NAME \
+                        or os.path.splitext(filename)[1] in ENCODING_SUFFIXES:
+                    continue
+                path = os.path.join(dirpath, filename)
+                relative_path = os.path.relpath(path, self.root).replace(os.sep, '/')
+                entry = entries.get(relative_path)
+                identity = self._read(path)
+                # Same content as built: a rebuilt file often keeps its size (e.g. fixed-length build ids)
+                if entry and entry['size'] == len(identity) and hashlib.sha256(identity).hexdigest() == entry['hash']:
+                    assets[relative_path] = self._load_built(relative_path, path, entry, identity)
+                else:
+                    # Siblings of a file changed since the build are stale
+                    siblings = {} if manifest else {
+                        encoding: os.path.join(dirpath, filename + suffix)
+                        for suffix, encoding in ENCODING_SUFFIXES.items()
+                        if filename + suffix in filenames
+                    }
+                    assets[relative_path] = self._load(relative_path, path, siblings, identity)
+        self.assets = assets
+
+    def _load_built(self, relative_path, path, entry, identity):
+        """Asset described by the build manifest"""
+        variants = {'identity': identity}
+        for encoding in entry['encodings']:
+            suffix = next(suffix for suffix, name in ENCODING_SUFFIXES.items() if name == encoding)
+            variants[encoding] = self._read(path + suffix)
+        return StaticAsset(
+            path=relative_path,
+            content_type=entry['content_type'],
+            etag=entry['hash'][:20],
+            last_modified=_get_last_modified(path),
+            cache_control=_get_cache_control(relative_path, entry['content_type']),
+            variants=variants,
+            preferred=entry['preferred'],
+        )
+
+    def _load(self, relative_path, path, siblings, identity):
+        """Asset unknown to the build manifest, described from the file itself"""
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        variants = {'identity': identity}
+        for encoding, sibling in siblings.items():
+            variants[encoding] = self._read(sibling)
+        if content_type.startswith(COMPRESSIBLE_TYPES):
+            for encoding in ENCODINGS:
+                if encoding not in variants:
+                    compressed = compress(identity[:], encoding)
+                    if compressed is not None:
+                        variants[encoding] = compressed
+        # Un variant compressé plus gros que l'original ne sert à rien
+        variants = {
+            encoding: body for encoding, body in variants.items()
+            if encoding == 'identity' or len(body) < len(identity)
+        }
+        return StaticAsset(
+            path=relative_path,
+            content_type=content_type,
+            etag=hashlib.sha256(identity).hexdigest()[:20],
+            last_modified=_get_last_modified(path),
+            cache_control=_get_cache_control(relative_path, content_type),
+            variants=variants,
+        )
+
+    def _read(self, path):
+        """Whole file as bytes when small, read-only mmap otherwise"""
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size <= self.inline_max or size == 0:
+                return f.read()
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _get_cache_control(relative_path, content_type):
+    if relative_path.startswith(IMMUTABLE_PREFIXES):
+        return CACHE_CONTROL_IMMUTABLE
+    if content_type == 'text/html':
+        return CACHE_CONTROL_HTML
+    return CACHE_CONTROL_DEFAULT
+
+
+def _get_last_modified(path):
+    return datetime.fromtimestamp(int(os.stat(path).st_mtime), timezone.utc)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_static_engine():
+    """Engine of the module's static/front folder, built on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                root = os.path.join(get_module_path(MODULE_NAME), 'static', 'front')
+                _engine = StaticEngine(root, int(config.get('cms_static_inline_max', 256 * 1024)))
+    return _engine
+
+
+def iter_chunks(body, chunk_size=64 * 1024):
+    """Stream a memory-mapped body without copying it whole"""
+    for offset in range(0, len(body), chunk_size):
+        yield body[offset:offset + chunk_size]
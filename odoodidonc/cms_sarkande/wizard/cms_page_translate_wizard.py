@@ -1,4 +1,42 @@
+import hashlib
+import re
+from collections import defaultdict
+
+from markupsafe import escape
+
 from odoo import models, fields, api
+from odoo.tools import config
+
+from odoo.addons.cms_sarkande.tools.lru import LRUCache
+
+# Rendered block previews, keyed by (dbname, block id, lang, content version)
+preview_fragment_cache = LRUCache(int(config.get('cms_preview_cache_size', 2048)))
+
+# Single <p> wrapper, ignored when detecting HTML content
+P_WRAPPER_RE = re.compile(r'^<p>(.*)</p>$', re.DOTALL)
+HTML_TAG_RE = re.compile(r'<[a-z][\s\S]*>', re.IGNORECASE)
+
+# Wrappers added by the Odoo HTML widget around plain text
+DIV_WIDGET_WRAPPER_RE = re.compile(r'^<div[^>]*>(.*)</div>$', re.DOTALL)
+P_WIDGET_WRAPPER_RE = re.compile(r'^<p[^>]*>(.*)</p>$', re.DOTALL)
+
+
+def is_html_content(value):
+    """Detect if content is HTML (complex HTML, not just a simple <p> wrapper)"""
+    clean_value = P_WRAPPER_RE.sub(r'\1', str(value).strip()).strip()
+    return bool(HTML_TAG_RE.search(clean_value))
+
+
+def strip_widget_wrapper(value):
+    """Remove the wrapper tags added by the Odoo HTML widget around plain text.
+
+    e.g. <div data-oe-version="2.0">text</div> -> text
+         <p data-oe-version="2.0">text</p> -> text
+         <p>text</p> -> text
+    """
+    value_str = DIV_WIDGET_WRAPPER_RE.sub(r'\1', str(value))
+    value_str = P_WIDGET_WRAPPER_RE.sub(r'\1', value_str)
+    return value_str.strip()
 
 
 class CmsPageTranslateWizard(models.TransientModel):
@@ -11,34 +49,91 @@ class CmsPageTranslateWizard(models.TransientModel):
 
     translation_line_ids = fields.One2many('cms.page.translate.line', 'wizard_id',
                                           string='Translations')
-    preview_html = fields.Html(string='Preview', compute='_compute_preview_html')
+    preview_fragments = fields.Json(string='Preview Fragments', compute='_compute_preview_fragments')
+    # Versions of the blocks the preview widget displays, sent back with each onchange
+    preview_versions = fields.Json(string='Displayed Preview Versions', store=False)
+
+    # Batched auto-save: edits are buffered in the lines and flushed together
+    auto_save = fields.Boolean(string='Auto-save', default=True)
+    auto_save_interval = fields.Integer(
+        string='Auto-save Interval (s)', default=lambda self: self._default_auto_save_interval(),
+        help='Minimum delay between two automatic saves; 0 saves on every change')
+    last_auto_save = fields.Datetime(string='Last Auto-save', readonly=True)
+    auto_save_message = fields.Char(string='Auto-save Status', readonly=True)
+
+    @api.model
+    def _default_auto_save_interval(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param('cms_sarkande.translation_autosave_interval', 10))
 
     @api.depends('page_id', 'lang_id', 'translation_line_ids.translated_value')
-    def _compute_preview_html(self):
-        """Generate preview HTML for the page"""
+    def _compute_preview_fragments(self):
+        """Generate the preview of the page, block by block.
+
+        Block fragments are cached by (block, language, content version), so an
+        edit only renders again the blocks whose lines changed. Every block gets
+        its version, but the HTML is only sent for the versions the preview
+        widget does not display yet (preview_versions): it patches those blocks
+        in its iframe and keeps the others.
+        """
+        dbname = self.env.cr.dbname
         for wizard in self:
             if not wizard.page_id:
-                wizard.preview_html = '<p>No page selected</p>'
+                wizard.preview_fragments = []
                 continue
 
-            html_parts = ['<div class="cms-page-preview">']
+            lang = wizard.lang_id.code if wizard.lang_id else 'en_US'
+            displayed = wizard.preview_versions or {}
+            # Current (possibly unsaved) values of the lines, by block and field label
+            values_by_block = defaultdict(dict)
+            for line in wizard.translation_line_ids:
+                values_by_block[line.block_id.id][line.field_label] = line._get_clean_translated_value() or ''
 
+            fragments = []
             for block in wizard.page_id.block_ids.sorted('sequence'):
-                block_html = wizard._get_block_preview_html(block)
+                values = values_by_block.get(block.id)
+                if values is None:
+                    values = wizard._get_block_preview_values(block, lang)
+                version = wizard._get_block_preview_version(block, values)
+                if displayed.get(str(block.id)) == version:
+                    fragments.append({'block_id': block.id, 'version': version})
+                    continue
+
+                key = (dbname, block.id, lang, version)
+                block_html = preview_fragment_cache.get(key)
+                if block_html is None:
+                    block_html = wizard._get_block_preview_html(block, values)
+                    preview_fragment_cache.put(key, block_html)
+
                 if block_html:
-                    html_parts.append(f'<div class="preview-block" data-block-id="{block.id}" data-block-name="{block.name}">{block_html}</div>')
+                    fragments.append({
+                        'block_id': block.id,
+                        'version': version,
+                        'html': f'<div class="preview-block" data-block-id="{block.id}" data-block-name="{escape(block.name)}" '
+                                f'data-block-version="{version}">{block_html}</div>',
+                    })
+
+            wizard.preview_fragments = fragments
 
-            html_parts.append('</div>')
-            wizard.preview_html = '\n'.join(html_parts)
+    def _get_block_preview_values(self, block, lang):
+        """Values of a block without translation lines, read from its components"""
+        return {
+            field_info['label']: field_info['component'].with_context(lang=lang)[field_info['field']] or ''
+            for field_info in block._get_translatable_fields()
+        }
 
-    def _get_block_preview_html(self, block):
-        """Generate HTML preview for a single block"""
-        lang = self.lang_id.code if self.lang_id else 'en_US'
+    def _get_block_preview_version(self, block, values):
+        """Content version of a block preview: a hash of everything it renders"""
+        content = [block.block_type, block.name, sorted(values.items())]
+        if block.block_type == 'image':
+            content += [block.image_url, block.image_alt]
+        return hashlib.sha1(repr(content).encode()).hexdigest()[:16]
 
+    def _get_block_preview_html(self, block, values):
+        """Generate HTML preview for a single block from its field values"""
         if block.block_type == 'hero':
-            title = block.hero_title_id.with_context(lang=lang).title if block.hero_title_id else ''
-            subtitle = block.hero_subtitle_id.with_context(lang=lang).title if block.hero_subtitle_id else ''
-            button = block.hero_button_text_id.with_context(lang=lang).title if block.hero_button_text_id else ''
+            title = values.get('Hero Title', '')
+            subtitle = values.get('Hero Subtitle', '')
+            button = values.get('Button Text', '')
             return f'''
                 <div class="hero-section" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 40px 20px; text-align: center; border-radius: 8px; margin: 10px 0;">
                     <h1 data-field="Hero Title" style="font-size: 32px; margin: 0 0 10px 0;">{title}</h1>
@@ -47,13 +142,13 @@ class CmsPageTranslateWizard(models.TransientModel):
                 </div>
             '''
         elif block.block_type == 'heading':
-            text = block.heading_title_id.with_context(lang=lang).title if block.heading_title_id else ''
+            text = values.get('Heading', '')
             return f'<h2 data-field="Heading" style="margin: 20px 0 10px 0;">{text}</h2>'
         elif block.block_type == 'text':
-            content = block.text_component_id.with_context(lang=lang).content if block.text_component_id else ''
+            content = values.get('Text Content', '')
             return f'<p data-field="Text Content" style="margin: 10px 0;">{content}</p>'
         elif block.block_type == 'html':
-            content = block.html_component_id.with_context(lang=lang).content if block.html_component_id else ''
+            content = values.get('HTML Content', '')
             return f'<div data-field="HTML Content" style="margin: 10px 0;">{content}</div>'
         elif block.block_type == 'image':
             return f'<img src="{block.image_url or ""}" alt="{block.image_alt or ""}" style="max-width: 100%; margin: 10px 0;">'
@@ -89,163 +184,149 @@ class CmsPageTranslateWizard(models.TransientModel):
     @api.onchange('lang_id')
     def _onchange_lang_id(self):
         """Reload translations when language changes"""
+        # Edits still buffered by the auto-save interval belong to the previous language
+        # (without auto-save they are discarded, as when closing the wizard)
+        if self.auto_save:
+            self._save_translations_to_db()
+
         if not self.page_id or not self.lang_id:
             self.translation_line_ids = [(5, 0, 0)]  # Clear all lines
             return
 
-        # Clear existing lines first to avoid duplicates
-        self.translation_line_ids = [(5, 0, 0)]
+        lines = self.translation_line_ids
+        if not lines or lines[0].block_id.page_id != self.page_id:
+            self.translation_line_ids = [(5, 0, 0)] + self._prepare_translation_lines(self.page_id, self.lang_id.code)
+            return
 
-        # Then add new lines
-        lines = self._prepare_translation_lines(self.page_id, self.lang_id.code)
-        self.translation_line_ids = lines
+        # Same page: keep the lines and only refresh their translated value
+        lang_code = self.lang_id.code
+        values = self._read_component_translations(
+            [(line.component_model, line.component_id, line.component_field) for line in lines],
+            [lang_code],
+        )
+        for line in lines:
+            translated_value = values[line.component_model][line.component_id][line.component_field][lang_code]
+            line.translated_value = translated_value
+            line.saved_value = translated_value
+            line.lang_code = lang_code
 
     def _prepare_translation_lines(self, page, lang_code):
         """Prepare translation lines for all blocks in page"""
         lines = []
 
-        for block in page.block_ids.sorted('sequence'):
-            # Skip non-translatable blocks
-            if block.block_type in ['user_list', 'image']:
-                continue
-
-            # Get translatable fields for this block
-            fields_info = self._get_block_translatable_fields(block)
-
+        # Skip non-translatable blocks, and image blocks whose alt text is left to the automatic translation
+        blocks = page.block_ids.sorted('sequence').filtered(lambda b: b.block_type not in ['user_list', 'image'])
+        # The lines write to the components: copy-on-write clones get their own first
+        blocks._detach_shared_components()
+        fields_by_block = [(block, block._get_translatable_fields()) for block in blocks]
+
+        # Read source (en_US) and translated values of all components at once
+        values = self._read_component_translations(
+            [
+                (field_info['component']._name, field_info['component'].id, field_info['field'])
+                for _block, fields_info in fields_by_block
+                for field_info in fields_info
+            ],
+            ['en_US', lang_code],
+        )
+
+        for block, fields_info in fields_by_block:
             for field_info in fields_info:
-                # Get source value (en_US)
-                source_value = self._get_field_value(
-                    field_info['component'],
-                    field_info['field'],
-                    'en_US'
-                )
-
-                # Get translated value
-                translated_value = self._get_field_value(
-                    field_info['component'],
-                    field_info['field'],
-                    lang_code
-                )
-
-                # Detect if content is HTML (check if source contains complex HTML, not just simple wrappers)
-                import re
-                value_str = str(source_value).strip()
-
-                # Remove single <p> wrapper to check if there's real HTML inside
-                clean_value = re.sub(r'^<p>(.*)</p>$', r'\1', value_str, flags=re.DOTALL).strip()
-
-                # Check if the cleaned content still has HTML tags
-                is_html = bool(re.search(r'<[a-z][\s\S]*>', clean_value, re.IGNORECASE))
+                component = field_info['component']
+                translations = values[component._name][component.id][field_info['field']]
+                source_value = translations['en_US']
 
                 lines.append((0, 0, {
                     'block_id': block.id,
                     'block_name': block.name,
                     'field_label': field_info['label'],
                     'source_value': source_value,
-                    'translated_value': translated_value,
-                    'component_model': field_info['component']._name,
-                    'component_id': field_info['component'].id,
+                    'translated_value': translations[lang_code],
+                    'saved_value': translations[lang_code],
+                    'lang_code': lang_code,
+                    'component_model': component._name,
+                    'component_id': component.id,
                     'component_field': field_info['field'],
-                    'is_html_content': is_html,
+                    'is_html_content': is_html_content(source_value),
                 }))
 
         return lines
 
-    def _get_block_translatable_fields(self, block):
-        """Get translatable fields for a block"""
-        fields_list = []
-
-        if block.block_type == 'html' and block.html_component_id:
-            fields_list.append({
-                'label': 'HTML Content',
-                'component': block.html_component_id,
-                'field': 'content',
-            })
-
-        elif block.block_type == 'text' and block.text_component_id:
-            fields_list.append({
-                'label': 'Text Content',
-                'component': block.text_component_id,
-                'field': 'content',
-            })
-
-        elif block.block_type == 'heading' and block.heading_title_id:
-            fields_list.append({
-                'label': 'Heading',
-                'component': block.heading_title_id,
-                'field': 'title',
-            })
-
-        elif block.block_type == 'hero':
-            if block.hero_title_id:
-                fields_list.append({
-                    'label': 'Hero Title',
-                    'component': block.hero_title_id,
-                    'field': 'title',
-                })
-            if block.hero_subtitle_id:
-                fields_list.append({
-                    'label': 'Hero Subtitle',
-                    'component': block.hero_subtitle_id,
-                    'field': 'title',
-                })
-            if block.hero_button_text_id:
-                fields_list.append({
-                    'label': 'Button Text',
-                    'component': block.hero_button_text_id,
-                    'field': 'title',
-                })
-
-        return fields_list
-
-    def _get_field_value(self, component, field_name, lang_code):
-        """Get field value in specific language"""
-        if not component:
-            return ''
-
-        # Use with_context to get translated value
-        record_with_lang = component.with_context(lang=lang_code)
-        return record_with_lang[field_name] or ''
+    def _read_component_translations(self, components, langs):
+        """Read component fields in several languages, one query per component model.
+
+        components is an iterable of (model name, component id, field name).
+        Returns {model name: {component id: {field: {lang: value}}}}.
+        """
+        ids_by_model = defaultdict(set)
+        fields_by_model = defaultdict(set)
+        for model_name, component_id, field_name in components:
+            ids_by_model[model_name].add(component_id)
+            fields_by_model[model_name].add(field_name)
+
+        return {
+            model_name: self.env[model_name].get_field_translations_multi(
+                component_ids, sorted(fields_by_model[model_name]), langs=langs)
+            for model_name, component_ids in ids_by_model.items()
+        }
+
+    @api.onchange('translation_line_ids')
+    def _onchange_translation_line_ids(self):
+        """Flush the edited lines once the auto-save interval has elapsed"""
+        if not self.auto_save:
+            return
+        now = fields.Datetime.now()
+        if self.last_auto_save and (now - self.last_auto_save).total_seconds() < self.auto_save_interval:
+            return
+
+        saved_lines = self._save_lines(self.translation_line_ids.filtered('is_dirty'))
+        self.last_auto_save = now
+        if saved_lines:
+            self.auto_save_message = f"{len(saved_lines)} traduction(s) enregistrée(s) : " + ', '.join(
+                f'{line.block_name} / {line.field_label}' for line in saved_lines)
 
     def _save_translations_to_db(self):
         """Internal method to save translations to database"""
-        lang_code = self.lang_id.code
+        return self._save_lines(self.translation_line_ids.filtered('is_dirty'))
 
-        for line in self.translation_line_ids:
-            translated_value = line.translated_value
+    def _save_lines(self, lines):
+        """Write the translated value of the given lines with one bulk update per component model.
 
-            if not translated_value:
-                continue
+        Each line is written in the language it was loaded in, which is not the
+        wizard's one anymore while the language is being switched.
+        Returns the lines that were written.
+        """
+        values_by_model = defaultdict(list)
+        human_translations = defaultdict(dict)
+        saved_lines = self.env['cms.page.translate.line']
 
-            # If the original content was NOT HTML, strip the HTML wrapper added by the widget
-            if not line.is_html_content:
-                # Remove wrapper tags added by Odoo HTML widget
-                # e.g., <div data-oe-version="2.0">text</div> -> text
-                #       <p data-oe-version="2.0">text</p> -> text
-                #       <p>text</p> -> text
-                import re
-                from markupsafe import Markup
+        for line in lines:
+            translated_value = line._get_clean_translated_value()
 
-                # Convert Markup to string if needed
-                value_str = str(translated_value)
+            if not translated_value:
+                continue
 
-                # Remove common wrapper patterns added by Odoo
-                # Pattern 1: <div ...>content</div>
-                value_str = re.sub(r'^<div[^>]*>(.*)</div>$', r'\1', value_str, flags=re.DOTALL)
-                # Pattern 2: Single <p ...>content</p> wrapper (with or without attributes)
-                value_str = re.sub(r'^<p[^>]*>(.*)</p>$', r'\1', value_str, flags=re.DOTALL)
+            values_by_model[line.component_model].append(
+                (line.component_id, line.component_field, line.lang_code or (self._origin.lang_id or self.lang_id).code, translated_value))
+            line.saved_value = translated_value
+            saved_lines |= line
 
-                translated_value = value_str.strip()
+        for model_name, values in values_by_model.items():
+            components = self.env[model_name]
+            # Write all the translated values of this component model at once
+            components.update_field_translations_multi(values)
 
-            # Get the component record with the target language context
-            component = self.env[line.component_model].browse(line.component_id)
-            component_with_lang = component.with_context(lang=lang_code)
+            # Feed the translation memory with the editor's translations
+            sources = components.get_field_translations_multi(
+                [value[0] for value in values], sorted({value[1] for value in values}), langs=['en_US'])
+            for component_id, field_name, lang_code, translated_value in values:
+                source_value = sources[component_id][field_name]['en_US']
+                if source_value and source_value != translated_value:
+                    human_translations[lang_code][source_value] = translated_value
 
-            # Write the translated value directly in the target language
-            # This will create/update the translation automatically
-            component_with_lang.write({
-                line.component_field: translated_value
-            })
+        for lang_code, translations in human_translations.items():
+            self.env['cms.translation.memory'].sudo()._store(translations, 'en_US', lang_code, origin='human')
+        return saved_lines
 
     def action_save_and_refresh(self):
         """Save translations and refresh the wizard to update preview"""
@@ -265,6 +346,12 @@ class CmsPageTranslateWizard(models.TransientModel):
         self._save_translations_to_db()
         return {'type': 'ir.actions.act_window_close'}
 
+    def action_close(self):
+        """Close the wizard, flushing the edits the auto-save interval still holds back"""
+        if self.auto_save:
+            self._save_translations_to_db()
+        return {'type': 'ir.actions.act_window_close'}
+
 
 class CmsPageTranslateLine(models.TransientModel):
     _name = 'cms.page.translate.line'
@@ -279,6 +366,9 @@ class CmsPageTranslateLine(models.TransientModel):
 
     source_value = fields.Html(string='Source (English)')
     translated_value = fields.Html(string='Translation')
+    saved_value = fields.Text(string='Saved Translation', help='Value currently stored on the component')
+    lang_code = fields.Char(string='Language Code', help='Language of the translated and saved values')
+    is_dirty = fields.Boolean(string='Modified', compute='_compute_is_dirty', store=True)
     is_html_content = fields.Boolean(string='Is HTML Content', default=False)
 
     # Component reference
@@ -286,49 +376,15 @@ class CmsPageTranslateLine(models.TransientModel):
     component_id = fields.Integer(string='Component ID')
     component_field = fields.Char(string='Component Field')
 
-    @api.onchange('translated_value')
-    def _onchange_translated_value(self):
-        """Auto-save translation on change to update preview"""
-        import logging
-        _logger = logging.getLogger(__name__)
-
-        # Skip if no translation yet
-        if not self.translated_value:
-            return
-
-        # Skip if source and translated are the same (initial load)
-        if self.source_value == self.translated_value:
-            return
-
-        # Only save if we have all required data
-        if not (self.component_model and self.component_id and self.component_field):
-            _logger.warning("Missing component data for auto-save")
-            return
-
-        # Get language from wizard_id if available
-        if not self.wizard_id or not self.wizard_id.lang_id:
-            _logger.warning("Missing wizard or language for auto-save")
-            return
-
-        # Save the translation immediately
-        translated_value = self.translated_value
-
-        # Clean HTML if needed
-        if not self.is_html_content:
-            import re
-            value_str = str(translated_value)
-            value_str = re.sub(r'^<div[^>]*>(.*)</div>$', r'\1', value_str, flags=re.DOTALL)
-            value_str = re.sub(r'^<p[^>]*>(.*)</p>$', r'\1', value_str, flags=re.DOTALL)
-            translated_value = value_str.strip()
-
-        # Save to component
-        try:
-            component = self.env[self.component_model].browse(self.component_id)
-            component_with_lang = component.with_context(lang=self.wizard_id.lang_id.code)
-            component_with_lang.write({
-                self.component_field: translated_value
-            })
-            _logger.info(f"Auto-saved translation for {self.component_model}({self.component_id}).{self.component_field}")
-        except Exception as e:
-            _logger.error(f"Error during auto-save: {e}")
-            pass
+    @api.depends('translated_value', 'saved_value', 'is_html_content')
+    def _compute_is_dirty(self):
+        for line in self:
+            line.is_dirty = (line._get_clean_translated_value() or '') != (line.saved_value or '')
+
+    def _get_clean_translated_value(self):
+        """Translated value as it must be stored on the component"""
+        self.ensure_one()
+        # If the original content was NOT HTML, strip the HTML wrapper added by the widget
+        if self.translated_value and not self.is_html_content:
+            return strip_widget_wrapper(self.translated_value)
+        return self.translated_value